@@ -1,60 +1,246 @@
 """Generate personalized hooks for concepts based on student interests."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, ClassVar
 from datetime import datetime
-import json
+import asyncio
+import hashlib
+import orjson
 import structlog
-from openai import AsyncOpenAI
 
 from app.core.config import settings
+from app.core.dependencies import get_openai_client, get_redis_cache
 from app.models.content import Concept
+from app.embeddings.rate_limiter import limiter
 
 logger = structlog.get_logger()
 
+# Settings read once at import; config changes already require a restart
+_CACHE_TTL = settings.CACHE_TTL
+
+
+class _StreamingObjectParser:
+    """Incrementally parse the top-level members of a streamed JSON object.
+    
+    Text is fed as it arrives; each ``(key, value)`` pair is returned as soon
+    as its value is complete.
+    """
+    
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._start: Optional[int] = None  # Start of the current top-level token
+        self._scalar = False
+        self._closed = False  # Top-level object fully received
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk of text and return newly completed members."""
+        self._text += chunk
+        text = self._text
+        pairs = []
+        
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        token = orjson.loads(text[self._start:i + 1])
+                        self._start = None
+                        if self._key is None:
+                            self._key = token
+                        else:
+                            pairs.append((self._key, token))
+                            self._key = None
+                continue
+            
+            if self._scalar and (ch == "," or ch == "}"):
+                pairs.append((self._key, orjson.loads(text[self._start:i].strip())))
+                self._key = None
+                self._start = None
+                self._scalar = False
+            
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._start = i
+            elif ch == "{" or ch == "[":
+                self._depth += 1
+                if self._depth == 2:
+                    self._start = i
+            elif ch == "}" or ch == "]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._closed = True
+                elif self._depth == 1 and self._start is not None:
+                    pairs.append((self._key, orjson.loads(text[self._start:i + 1])))
+                    self._key = None
+                    self._start = None
+            elif (
+                self._depth == 1 and self._key is not None and self._start is None
+                and ch not in " \t\r\n:,"
+            ):
+                # Number, true, false or null
+                self._start = i
+                self._scalar = True
+        
+        self._pos = len(text)
+        return pairs
+    
+    def close(self) -> None:
+        """Check that the stream ended with a complete top-level object."""
+        if not self._closed:
+            raise ValueError("Streamed response is not a complete JSON object")
+
 
 class HookGenerator:
     """Generate personalized hooks and relevance content."""
     
+    # System prompt for hook generation
+    _SYSTEM_PROMPT: ClassVar[str] = """You are an expert educational content creator specializing in making 
+        academic concepts relevant and engaging for students. Your task is to create 
+        personalized "hooks" that connect educational concepts to students' interests 
+        and life goals.
+        
+        For each hook, you should:
+        1. Make a clear connection between the concept and the student's interest
+        2. Explain why this concept matters in their context
+        3. Use age-appropriate language and examples
+        4. Be inspiring and motivational
+        5. Keep each hook concise (2-3 sentences)
+        
+        Return your response as a JSON object with the requested categories as keys."""
+    
+    # User prompt for hook generation; filled in by _create_hook_prompt
+    _USER_TEMPLATE: ClassVar[str] = """Create personalized hooks for the following educational concept:
+        
+        Concept: {name}
+        Content: {content}...
+        Type: {type}
+        
+        Student Interests: {interests}
+        
+        Generate hooks for these categories: {categories}
+        
+        For each category, create a hook that:
+        - Connects the concept to relevant student interests
+        - Explains why this concept matters in that context
+        - Is engaging and age-appropriate
+        
+        Example format:
+        {{
+            "personal": "Since you love [interest], understanding [concept] will help you...",
+            "career": "In your future career as [career interest], [concept] is essential because...",
+            "social": "When working with others on [social interest], [concept] helps you...",
+            "philanthropic": "To make a difference in [cause], knowing [concept] enables you..."
+        }}
+        """
+    
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_openai_client()
         self.model = "gpt-4o"
     
     async def generate_hooks(
         self,
         concept: Concept,
         student_interests: List[str],
-        categories: List[str]
+        categories: List[str],
+        use_cache: bool = True
     ) -> Dict[str, Any]:
-        """Generate personalized hooks for a concept."""
+        """Generate personalized hooks for a concept.
+        
+        Results are cached per (concept, interests, categories); pass
+        ``use_cache=False`` to force a fresh generation.
+        """
+        key = self._hook_cache_key(concept, student_interests, categories)
+        
+        if use_cache:
+            try:
+                cache = await get_redis_cache()
+                cached = await cache.get(key)
+                if cached:
+                    hooks = orjson.loads(cached)
+                    # Entries written before partial results were rejected
+                    if all(category in hooks for category in categories):
+                        return hooks
+            except Exception as e:
+                logger.warning("Hook cache read failed", error=str(e))
+        
+        hooks = {}
+        async for category, hook in self.stream_hooks(concept, student_interests, categories):
+            hooks[category] = hook
+        
+        # Add metadata
+        hooks["concept_id"] = concept.concept_id
+        hooks["generated_at"] = datetime.utcnow().isoformat()
+        
+        logger.info(
+            "Generated hooks",
+            concept_id=concept.concept_id,
+            categories=categories
+        )
+        
+        # Never cache a partial result; it would be served until the TTL expires
+        if all(category in hooks for category in categories):
+            try:
+                cache = await get_redis_cache()
+                await cache.set(key, orjson.dumps(hooks), ttl=_CACHE_TTL)
+            except Exception as e:
+                logger.warning("Hook cache write failed", error=str(e))
+        
+        return hooks
+    
+    async def stream_hooks(
+        self,
+        concept: Concept,
+        student_interests: List[str],
+        categories: List[str]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream personalized hooks, yielding each category as soon as it completes."""
         try:
             # Prepare the prompt
             prompt = self._create_hook_prompt(concept, student_interests, categories)
             
+            # Rate limiting (rough estimate of ~4 characters per token)
+            await limiter.acquire(len(prompt) // 4)
+            
             # Generate hooks
-            response = await self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
+                    {"role": "system", "content": self._SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                stream=True
             )
             
-            # Parse response
-            hooks = json.loads(response.choices[0].message.content)
-            
-            # Add metadata
-            hooks["concept_id"] = concept.concept_id
-            hooks["generated_at"] = datetime.utcnow().isoformat()
-            
-            logger.info(
-                "Generated hooks",
-                concept_id=concept.concept_id,
-                categories=categories
-            )
+            # Parse response incrementally
+            parser = _StreamingObjectParser()
+            received = set()
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    for category, hook in parser.feed(delta):
+                        received.add(category)
+                        yield category, hook
             
-            return hooks
+            # A truncated or non-JSON response must not pass as a partial result
+            parser.close()
+            missing = [category for category in categories if category not in received]
+            if missing:
+                raise ValueError(f"Hook response is missing categories: {', '.join(missing)}")
             
         except Exception as e:
             logger.error(
@@ -64,21 +250,42 @@ class HookGenerator:
             )
             raise
     
-    def _get_system_prompt(self) -> str:
-        """Get system prompt for hook generation."""
-        return """You are an expert educational content creator specializing in making 
-        academic concepts relevant and engaging for students. Your task is to create 
-        personalized "hooks" that connect educational concepts to students' interests 
-        and life goals.
+    async def generate_hooks_many(
+        self,
+        concepts: List[Concept],
+        student_interests: List[str],
+        categories: List[str],
+        max_concurrency: int = 20
+    ) -> List[Any]:
+        """Generate hooks for many concepts concurrently.
         
-        For each hook, you should:
-        1. Make a clear connection between the concept and the student's interest
-        2. Explain why this concept matters in their context
-        3. Use age-appropriate language and examples
-        4. Be inspiring and motivational
-        5. Keep each hook concise (2-3 sentences)
+        Results are returned in the order of ``concepts``; a failed concept
+        yields its exception instead of a hooks dict.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
         
-        Return your response as a JSON object with the requested categories as keys."""
+        async def _one(concept: Concept) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_hooks(concept, student_interests, categories)
+        
+        return await asyncio.gather(
+            *[_one(concept) for concept in concepts],
+            return_exceptions=True
+        )
+    
+    def _hook_cache_key(
+        self,
+        concept: Concept,
+        student_interests: List[str],
+        categories: List[str]
+    ) -> str:
+        """Build the cache key for a concept's hooks."""
+        raw = "|".join([
+            concept.concept_id,
+            ",".join(sorted(student_interests)),
+            ",".join(sorted(categories))
+        ])
+        return f"hooks:{hashlib.sha256(raw.encode()).hexdigest()}"
     
     def _create_hook_prompt(
         self,
@@ -87,31 +294,13 @@ class HookGenerator:
         categories: List[str]
     ) -> str:
         """Create prompt for hook generation."""
-        prompt = f"""Create personalized hooks for the following educational concept:
-        
-        Concept: {concept.name}
-        Content: {concept.content[:500]}...
-        Type: {concept.type.value}
-        
-        Student Interests: {', '.join(student_interests)}
-        
-        Generate hooks for these categories: {', '.join(categories)}
-        
-        For each category, create a hook that:
-        - Connects the concept to relevant student interests
-        - Explains why this concept matters in that context
-        - Is engaging and age-appropriate
-        
-        Example format:
-        {{
-            "personal": "Since you love [interest], understanding [concept] will help you...",
-            "career": "In your future career as [career interest], [concept] is essential because...",
-            "social": "When working with others on [social interest], [concept] helps you...",
-            "philanthropic": "To make a difference in [cause], knowing [concept] enables you..."
-        }}
-        """
-        
-        return prompt
+        return self._USER_TEMPLATE.format_map({
+            "name": concept.name,
+            "content": concept.content[:500],
+            "type": concept.type.value,
+            "interests": ", ".join(student_interests),
+            "categories": ", ".join(categories)
+        })
     
     async def generate_examples(
         self,
@@ -135,6 +324,9 @@ class HookGenerator:
             
             Return as a JSON array of objects with 'title', 'content', and 'difficulty' fields."""
             
+            # Rate limiting (rough estimate of ~4 characters per token)
+            await limiter.acquire(len(prompt) // 4)
+            
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -145,7 +337,7 @@ class HookGenerator:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             examples = result.get("examples", [])
             
             # Add metadata
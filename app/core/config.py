@@ -5,7 +5,7 @@ from functools import lru_cache
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
-import json
+import orjson
 
 
 class Settings(BaseSettings):
@@ -29,6 +29,9 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     EMBEDDING_DIMENSION: int = 1536
     EMBEDDING_BATCH_SIZE: int = 100
+    EMBEDDING_CONCURRENCY: int = 4  # Embedding batches in flight at once
+    OPENAI_RPM_LIMIT: int = 3000
+    OPENAI_TPM_LIMIT: int = 1000000
     
     # Pinecone
     PINECONE_API_KEY: str
@@ -36,12 +39,14 @@ class Settings(BaseSettings):
     PINECONE_INDEX_NAME: str = "spool-content"
     PINECONE_DIMENSION: int = 1536
     PINECONE_METRIC: str = "cosine"
+    PINECONE_INT8: bool = False  # Upsert int8-quantized values (cosine metric only)
     
     # Neo4j
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USERNAME: str = "neo4j"
     NEO4J_PASSWORD: str
     NEO4J_DATABASE: str = "neo4j"
+    NEO4J_QUERY_TIMEOUT: float = 5.0  # Seconds before a read query is cancelled
     
     # AWS
     AWS_REGION: str = "us-east-1"
@@ -55,6 +60,7 @@ class Settings(BaseSettings):
     
     # Processing
     MAX_PDF_SIZE_MB: int = 100
+    PDF_WORKERS: int = 2  # PDF parsing processes per app worker
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
     MAX_CONCURRENT_JOBS: int = 5
@@ -68,12 +74,12 @@ class Settings(BaseSettings):
     
     @field_validator("CORS_ORIGINS", mode="before")
     def parse_cors_origins(cls, v):
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return [origin.strip() for origin in v.split(",")]
-        return v
+        if not isinstance(v, str):
+            return v
+        try:
+            return orjson.loads(v)
+        except orjson.JSONDecodeError:
+            return [origin.strip() for origin in v.split(",") if origin.strip()]
     
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
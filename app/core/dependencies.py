@@ -1,109 +1,151 @@
 """Shared dependencies for Content Service."""
 
-from typing import Optional
-import pinecone
+from typing import Awaitable, Callable, Optional, TypeVar
+from functools import lru_cache, wraps
+import asyncio
+import httpx
+from pinecone import PineconeAsyncio, ServerlessSpec
+from openai import AsyncOpenAI
 from neo4j import AsyncGraphDatabase
 import structlog
-import boto3
+import aioboto3
 from aiocache import Cache
-import redis
+from aiocache.serializers import NullSerializer
+import redis.asyncio as aioredis
 
 from app.core.config import settings
+from app.core.job_store import RedisJobStore, InMemoryJobStore
 
 logger = structlog.get_logger()
 
-# Global instances
-_neo4j_driver: Optional[AsyncGraphDatabase.driver] = None
-_pinecone_index = None
-_s3_client = None
-_redis_cache = None
+T = TypeVar("T")
 
 
-async def get_neo4j_client():
-    """Get Neo4j async driver instance."""
-    global _neo4j_driver
+def async_singleton(factory: Callable[[], Awaitable[T]]) -> Callable[[], Awaitable[T]]:
+    """Cache the result of an async factory, initializing it at most once."""
+    lock = asyncio.Lock()
+    instance: Optional[T] = None
     
-    if _neo4j_driver is None:
-        try:
-            _neo4j_driver = AsyncGraphDatabase.driver(
-                settings.NEO4J_URI,
-                auth=(settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD),
-                max_connection_pool_size=50
-            )
-            await _neo4j_driver.verify_connectivity()
-            logger.info("Neo4j connection established")
-        except Exception as e:
-            logger.error("Failed to connect to Neo4j", error=str(e))
-            raise
+    @wraps(factory)
+    async def wrapper() -> T:
+        nonlocal instance
+        if instance is None:
+            async with lock:
+                if instance is None:
+                    instance = await factory()
+        return instance
     
-    return _neo4j_driver
+    return wrapper
+
+
+@async_singleton
+async def get_neo4j_client():
+    """Get Neo4j async driver instance."""
+    try:
+        driver = AsyncGraphDatabase.driver(
+            settings.NEO4J_URI,
+            auth=(settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD),
+            max_connection_pool_size=100,
+            max_connection_lifetime=3600
+        )
+        await driver.verify_connectivity()
+        logger.info("Neo4j connection established")
+        return driver
+    except Exception as e:
+        logger.error("Failed to connect to Neo4j", error=str(e))
+        raise
 
 
+@async_singleton
 async def get_pinecone_client():
-    """Get Pinecone index instance."""
-    global _pinecone_index
-    
-    if _pinecone_index is None:
+    """Get Pinecone asyncio index instance."""
+    try:
+        # Control plane client is only needed to resolve the index host
+        pc = PineconeAsyncio(api_key=settings.PINECONE_API_KEY)
         try:
-            # Initialize Pinecone
-            pc = pinecone.Pinecone(
-                api_key=settings.PINECONE_API_KEY,
-                environment=settings.PINECONE_ENVIRONMENT
-            )
-            
             # Get or create index
             index_name = settings.PINECONE_INDEX_NAME
             
-            if index_name not in pc.list_indexes().names():
+            if not await pc.has_index(index_name):
                 # Create index if it doesn't exist
-                pc.create_index(
+                await pc.create_index(
                     name=index_name,
                     dimension=settings.PINECONE_DIMENSION,
                     metric=settings.PINECONE_METRIC,
-                    spec=pinecone.ServerlessSpec(
+                    spec=ServerlessSpec(
                         cloud="aws",
                         region=settings.PINECONE_ENVIRONMENT
                     )
                 )
                 logger.info(f"Created Pinecone index: {index_name}")
             
-            _pinecone_index = pc.Index(index_name)
-            logger.info("Pinecone connection established")
-        except Exception as e:
-            logger.error("Failed to connect to Pinecone", error=str(e))
-            raise
-    
-    return _pinecone_index
+            description = await pc.describe_index(index_name)
+            index = pc.IndexAsyncio(host=description.host)
+        finally:
+            await pc.close()
+        
+        logger.info("Pinecone connection established")
+        return index
+    except Exception as e:
+        logger.error("Failed to connect to Pinecone", error=str(e))
+        raise
 
 
 def get_s3_client():
-    """Get S3 client instance."""
-    global _s3_client
-    
-    if _s3_client is None:
-        session = boto3.Session(
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
-        _s3_client = session.client("s3")
-        logger.info("S3 client initialized")
-    
-    return _s3_client
+    """Get async S3 client context manager; enter it once at startup."""
+    session = aioboto3.Session(
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION
+    )
+    return session.client("s3")
 
 
+@async_singleton
 async def get_redis_cache():
     """Get Redis cache instance."""
-    global _redis_cache
-    
-    if _redis_cache is None:
-        try:
-            _redis_cache = Cache.from_url(settings.REDIS_URL)
-            await _redis_cache.exists("test")  # Test connection
-            logger.info("Redis cache connection established")
-        except Exception as e:
-            logger.warning(f"Redis cache not available: {e}")
-            # Fallback to in-memory cache
-            _redis_cache = Cache(Cache.MEMORY)
-    
-    return _redis_cache
\ No newline at end of file
+    try:
+        cache = Cache.from_url(settings.REDIS_URL)
+        # Values are already bytes (packed embeddings, orjson); never unpickle
+        # what comes back from Redis
+        cache.serializer = NullSerializer()
+        await cache.exists("test")  # Test connection
+        logger.info("Redis cache connection established")
+        return cache
+    except Exception as e:
+        logger.warning(f"Redis cache not available: {e}")
+        # Fallback to in-memory cache
+        return Cache(Cache.MEMORY, serializer=NullSerializer())
+
+
+@async_singleton
+async def get_redis_client() -> aioredis.Redis:
+    """Get shared asyncio Redis client."""
+    client = aioredis.from_url(settings.REDIS_URL)
+    await client.ping()  # Test connection
+    logger.info("Redis connection established")
+    return client
+
+
+@async_singleton
+async def get_job_store():
+    """Get processing job store instance."""
+    try:
+        client = await get_redis_client()
+        return RedisJobStore(client)
+    except Exception as e:
+        logger.warning(f"Redis job store not available: {e}")
+        # Fallback to worker-local job tracking
+        return InMemoryJobStore()
+
+
+@lru_cache()
+def get_openai_client() -> AsyncOpenAI:
+    """Get shared OpenAI client with a pooled HTTP connection."""
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=60
+        )
+    )
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""Processing job state shared across workers."""
+
+from typing import Dict, Optional
+import redis.asyncio as aioredis
+
+from app.models.content import ProcessingJob
+
+# Finished jobs are kept around for status polling, then evicted
+JOB_TTL = 24 * 60 * 60
+
+
+class RedisJobStore:
+    """Store processing jobs in Redis hashes keyed by ``job:{id}``.
+    
+    The serialized job lives in the ``data`` field; ``progress`` is a separate
+    field so progress updates are a single cheap HSET.
+    """
+    
+    def __init__(self, client: aioredis.Redis, ttl: int = JOB_TTL):
+        self.client = client
+        self.ttl = ttl
+    
+    def _key(self, job_id: str) -> str:
+        return f"job:{job_id}"
+    
+    async def set(self, job: ProcessingJob) -> None:
+        """Save the full job state."""
+        key = self._key(job.job_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "data": job.model_dump_json(),
+                "progress": job.progress
+            })
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+    
+    async def set_progress(self, job_id: str, progress: int) -> None:
+        """Update only the progress of a job."""
+        await self.client.hset(self._key(job_id), "progress", progress)
+    
+    async def get(self, job_id: str) -> Optional[ProcessingJob]:
+        """Load a job, or None if it is unknown or expired."""
+        fields = await self.client.hgetall(self._key(job_id))
+        if not fields or b"data" not in fields:
+            return None
+        
+        job = ProcessingJob.model_validate_json(fields[b"data"])
+        if b"progress" in fields:
+            job.progress = int(fields[b"progress"])
+        return job
+
+
+class InMemoryJobStore:
+    """Worker-local job store used when Redis is unavailable."""
+    
+    def __init__(self):
+        self._jobs: Dict[str, ProcessingJob] = {}
+    
+    async def set(self, job: ProcessingJob) -> None:
+        """Save the full job state."""
+        self._jobs[job.job_id] = job.model_copy()
+    
+    async def set_progress(self, job_id: str, progress: int) -> None:
+        """Update only the progress of a job."""
+        job = self._jobs.get(job_id)
+        if job:
+            job.progress = progress
+    
+    async def get(self, job_id: str) -> Optional[ProcessingJob]:
+        """Load a job, or None if it is unknown."""
+        job = self._jobs.get(job_id)
+        return job.model_copy() if job else None
\ No newline at end of file
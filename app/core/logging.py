@@ -1,6 +1,8 @@
 """Structured logging configuration."""
 
+import logging
 import sys
+import orjson
 import structlog
 from structlog.processors import JSONRenderer, TimeStamper, add_log_level
 from structlog.stdlib import add_logger_name
@@ -8,19 +10,25 @@ from structlog.stdlib import add_logger_name
 from app.core.config import settings
 
 
+def _orjson_dumps(obj, **kwargs) -> str:
+    """Serialize a log event with orjson; the stdlib logger needs str, not bytes."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, **kwargs).decode()
+
+
 def setup_logging():
     """Configure structured logging."""
     
     # Determine renderer based on environment
     if settings.LOG_FORMAT == "json":
-        renderer = JSONRenderer()
+        renderer = JSONRenderer(serializer=_orjson_dumps)
     else:
         renderer = structlog.dev.ConsoleRenderer()
     
+    log_level = getattr(logging, settings.LOG_LEVEL)
+    
     # Configure structlog
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
             structlog.contextvars.merge_contextvars,
             add_log_level,
             add_logger_name,
@@ -31,14 +39,15 @@ def setup_logging():
             renderer,
         ],
         context_class=dict,
+        # Drops calls below the configured level before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
     
     # Set log level
-    import logging
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, settings.LOG_LEVEL),
+        level=log_level,
     )
\ No newline at end of file
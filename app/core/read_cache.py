@@ -0,0 +1,88 @@
+"""In-process caches for hot read paths, invalidated across workers."""
+
+from typing import Any, Awaitable, Callable, List, TypeVar
+from functools import wraps
+from cachetools import TTLCache
+import structlog
+
+from app.core.dependencies import get_redis_client
+
+logger = structlog.get_logger()
+
+# Redis pub/sub channel telling every worker to drop its read caches
+INVALIDATE_CHANNEL = "cache:invalidate:all"
+
+T = TypeVar("T")
+
+# Every cache created through new_cache, so they can be cleared together
+_caches: List[TTLCache] = []
+
+
+def new_cache(maxsize: int = 2048, ttl: int = 300) -> TTLCache:
+    """Create a TTL cache that is cleared along with all other read caches."""
+    cache = TTLCache(maxsize=maxsize, ttl=ttl)
+    _caches.append(cache)
+    return cache
+
+
+def clear_all() -> None:
+    """Clear every read cache in this process."""
+    for cache in _caches:
+        cache.clear()
+
+
+def cached(
+    namespace: str,
+    maxsize: int = 2048,
+    ttl: int = 300
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Cache a route handler's result by its ``concept_id`` and ``limit`` arguments.
+    
+    Only successful results are cached; raised exceptions (e.g. 404s) are not.
+    """
+    cache = new_cache(maxsize, ttl)
+    
+    def decorator(handler: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(handler)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            key = f"{namespace}:{kwargs.get('concept_id')}:{kwargs.get('limit', '')}"
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+            
+            result = await handler(*args, **kwargs)
+            cache[key] = result
+            return result
+        
+        return wrapper
+    
+    return decorator
+
+
+async def publish_invalidation() -> None:
+    """Clear read caches here and tell every other worker to do the same."""
+    clear_all()
+    try:
+        client = await get_redis_client()
+        await client.publish(INVALIDATE_CHANNEL, "all")
+    except Exception as e:
+        logger.warning("Read cache invalidation not published", error=str(e))
+
+
+async def listen_for_invalidation() -> None:
+    """Clear read caches whenever an invalidation is published; runs until cancelled."""
+    try:
+        client = await get_redis_client()
+    except Exception as e:
+        logger.warning("Read cache invalidation listener not started", error=str(e))
+        return
+    
+    pubsub = client.pubsub()
+    await pubsub.subscribe(INVALIDATE_CHANNEL)
+    try:
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                clear_all()
+    finally:
+        await pubsub.aclose()
\ No newline at end of file
@@ -1,152 +1,324 @@
 """Generate embeddings for content using OpenAI."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Optional, Tuple
 import asyncio
-from tenacity import retry, stop_after_attempt, wait_exponential
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import struct
+import numpy as np
 import openai
 import tiktoken
 import structlog
 
 from app.core.config import settings
-from app.models.content import Concept, Book
+from app.core.dependencies import get_redis_cache, get_openai_client
+from app.models.content import Concept, Book, Chapter
+from app.embeddings.rate_limiter import limiter
+from app.embeddings.quantization import quantize_embedding, dequantize_embedding
 
 logger = structlog.get_logger()
 
+# Settings read once at import; config changes already require a restart
+_MODEL = settings.EMBEDDING_MODEL
+_DIM = settings.EMBEDDING_DIMENSION
+_BATCH = settings.EMBEDDING_BATCH_SIZE
+_CACHE_TTL = settings.CACHE_TTL
+
+# Cached embeddings are this little-endian float32 scale followed by int8 values
+_SCALE_FORMAT = struct.Struct("<f")
+
+# BPE tables are expensive to build; share one encoder across instances
+_ENCODING = tiktoken.encoding_for_model("text-embedding-3-small")
+
+# Bounds concurrent single-text requests when a batch falls back
+_fallback_semaphore = asyncio.Semaphore(_BATCH)
+
+# Bounds embedding batches in flight across all callers
+_batch_semaphore = asyncio.Semaphore(settings.EMBEDDING_CONCURRENCY)
+
+# Tokenization and numpy packing release the GIL, so a thread pool keeps
+# them off the event loop
+_EMBED_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="embed")
+
+
+async def _in_pool(fn, *args):
+    """Run CPU-bound local work in the embedding thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_EMBED_POOL, fn, *args)
+
 
 class EmbeddingGenerator:
     """Generate embeddings for educational content."""
     
     def __init__(self):
-        self.client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model = settings.EMBEDDING_MODEL
-        self.dimension = settings.EMBEDDING_DIMENSION
-        self.batch_size = settings.EMBEDDING_BATCH_SIZE
-        self.encoding = tiktoken.encoding_for_model("text-embedding-3-small")
+        self.client = get_openai_client()
+        self.model = _MODEL
+        self.dimension = _DIM
+        self.batch_size = _BATCH
+        self.encoding = _ENCODING
         self.max_tokens = 8191  # Model limit
+        self.max_attempts = 3
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a single text."""
         try:
+            key = self._cache_key(text)
+            cached = (await self._get_cached([key]))[0]
+            if cached is not None:
+                return cached
+            
             # Truncate if too long
-            text = self._truncate_text(text)
+            text, token_count = await _in_pool(self._truncate_text, text)
             
-            response = await self.client.embeddings.create(
-                model=self.model,
-                input=text,
-                dimensions=self.dimension
-            )
+            for attempt in range(self.max_attempts):
+                # Rate limiting
+                await limiter.acquire(token_count)
+                
+                try:
+                    response = await self.client.embeddings.create(
+                        model=self.model,
+                        input=text,
+                        dimensions=self.dimension
+                    )
+                    break
+                except (openai.RateLimitError, openai.APITimeoutError):
+                    if attempt == self.max_attempts - 1:
+                        raise
+                    # Exponential backoff with jitter
+                    await asyncio.sleep(min(10, 4 * 2 ** attempt) + random.random())
+            
+            embedding = response.data[0].embedding
+            await self._set_cached([(key, embedding)])
             
-            return response.data[0].embedding
+            return embedding
             
         except Exception as e:
             logger.error("Embedding generation failed", error=str(e))
             raise
     
     async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts in batches."""
-        embeddings = []
-        
-        # Process in batches
-        for i in range(0, len(texts), self.batch_size):
-            batch = texts[i:i + self.batch_size]
+        """Generate embeddings for multiple texts in concurrent batches."""
+        batches = await asyncio.gather(*[
+            self._embed_batch(i, texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ])
+        return [embedding for batch in batches for embedding in batch]
+    
+    async def _embed_batch(self, batch_index: int, batch: List[str]) -> List[List[float]]:
+        """Embed one batch of texts, serving cache hits and sending misses to the API."""
+        async with _batch_semaphore:
+            keys = [self._cache_key(text) for text in batch]
+            batch_embeddings = await self._get_cached(keys)
+            missing = [j for j, embedding in enumerate(batch_embeddings) if embedding is None]
             
-            try:
-                # Truncate texts if needed
-                batch = [self._truncate_text(text) for text in batch]
-                
-                response = await self.client.embeddings.create(
-                    model=self.model,
-                    input=batch,
-                    dimensions=self.dimension
-                )
+            if missing:
+                # Send each distinct text once and scatter results back
+                unique: Dict[str, int] = {}
+                idx_map = [unique.setdefault(batch[j], len(unique)) for j in missing]
+                unique_texts = list(unique)
                 
-                batch_embeddings = [item.embedding for item in response.data]
-                embeddings.extend(batch_embeddings)
+                try:
+                    # Truncate texts if needed
+                    inputs, token_count = await _in_pool(self._truncate_batch, unique_texts)
+                    
+                    # Rate limiting
+                    await limiter.acquire(token_count, requests=1)
+                    
+                    response = await self.client.embeddings.create(
+                        model=self.model,
+                        input=inputs,
+                        dimensions=self.dimension
+                    )
+                    
+                    unique_embeddings = [item.embedding for item in response.data]
+                    
+                    await self._set_cached([
+                        (self._cache_key(text), embedding)
+                        for text, embedding in zip(unique_texts, unique_embeddings)
+                    ])
+                    
+                except Exception as e:
+                    logger.error(
+                        "Batch embedding generation failed",
+                        batch_index=batch_index,
+                        error=str(e)
+                    )
+                    # Generate individually as fallback
+                    unique_embeddings = await self._generate_individually(unique_texts)
                 
-                logger.info(
-                    "Generated embeddings batch",
-                    batch_size=len(batch),
-                    total_processed=len(embeddings)
-                )
-                
-                # Rate limiting
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(
-                    "Batch embedding generation failed",
-                    batch_index=i,
-                    error=str(e)
-                )
-                # Generate individually as fallback
-                for text in batch:
-                    try:
-                        embedding = await self.generate_embedding(text)
-                        embeddings.append(embedding)
-                    except:
-                        # Use zero vector as last resort
-                        embeddings.append([0.0] * self.dimension)
-        
-        return embeddings
+                for j, u in zip(missing, idx_map):
+                    batch_embeddings[j] = unique_embeddings[u]
+            
+            logger.debug(
+                "Generated embeddings batch",
+                batch_index=batch_index,
+                batch_size=len(batch),
+                cache_hits=len(batch) - len(missing)
+            )
+            
+            return batch_embeddings
+    
+    async def _generate_individually(self, batch: List[str]) -> List[List[float]]:
+        """Embed each text on its own, concurrently, for a failed batch."""
+        async def _one(text: str) -> List[float]:
+            async with _fallback_semaphore:
+                return await self.generate_embedding(text)
+        
+        results = await asyncio.gather(
+            *[_one(text) for text in batch],
+            return_exceptions=True
+        )
+        
+        # Use zero vector as last resort
+        return [
+            [0.0] * self.dimension if isinstance(result, BaseException) else result
+            for result in results
+        ]
     
     async def process_book(self, book: Book) -> Book:
         """Generate embeddings for all concepts in a book."""
-        total_concepts = 0
-        processed_concepts = 0
+        book.concept_ids, book.embeddings = await self.process_chapters(book, book.chapters)
+        return book
+    
+    async def process_chapters(
+        self,
+        book: Book,
+        chapters: List[Chapter]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate embeddings for the concepts in ``chapters``.
+        
+        Returns parallel concept id and embedding arrays; the embeddings form
+        one contiguous matrix and each concept gets a row view of it.
+        """
+        total_concepts = sum(
+            len(section.concepts)
+            for chapter in chapters
+            for section in chapter.sections
+        )
         
-        # Collect all concepts
-        all_concepts = []
-        for chapter in book.chapters:
+        # Collect concepts and their texts in a single pass
+        texts: List[Optional[str]] = [None] * total_concepts
+        concept_refs: List[Optional[Concept]] = [None] * total_concepts
+        i = 0
+        for chapter in chapters:
             for section in chapter.sections:
                 for concept in section.concepts:
-                    all_concepts.append((chapter, section, concept))
-                    total_concepts += 1
-        
-        # Prepare texts for embedding
-        texts = []
-        for chapter, section, concept in all_concepts:
-            # Create rich text representation
-            text = self._create_concept_text(concept, chapter.title, section.title)
-            texts.append(text)
+                    # Create rich text representation
+                    texts[i] = self._create_concept_text(concept, chapter.title, section.title)
+                    concept_refs[i] = concept
+                    i += 1
         
         # Generate embeddings
         logger.info(
             "Generating embeddings for book",
             title=book.title,
+            chapters=len(chapters),
             total_concepts=total_concepts
         )
         
         embeddings = await self.generate_embeddings_batch(texts)
         
+        # Pack into one contiguous matrix
+        matrix = await _in_pool(self._pack, embeddings)
+        concept_ids = np.array([concept.concept_id for concept in concept_refs], dtype=object)
+        
         # Assign embeddings back to concepts
-        for i, (chapter, section, concept) in enumerate(all_concepts):
-            if i < len(embeddings):
-                concept.embedding = embeddings[i]
-                processed_concepts += 1
+        for concept, embedding in zip(concept_refs, matrix):
+            concept.embedding = embedding
         
         logger.info(
             "Embeddings generation completed",
             title=book.title,
-            processed=processed_concepts,
+            processed=len(embeddings),
             total=total_concepts
         )
         
-        return book
+        return concept_ids, matrix
+    
+    def _cache_key(self, text: str) -> str:
+        """Build the cache key for an embedding of ``text``."""
+        digest = hashlib.sha256(f"{self.model}|{self.dimension}|{text}".encode()).hexdigest()
+        return f"emb:{digest}"
+    
+    async def _get_cached(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """Fetch cached embeddings, returning None for misses."""
+        try:
+            cache = await get_redis_cache()
+            hits = await cache.multi_get(keys)
+        except Exception as e:
+            logger.warning("Embedding cache read failed", error=str(e))
+            return [None] * len(keys)
+        
+        return await _in_pool(self._decode_cached, hits)
+    
+    async def _set_cached(self, items: List[Tuple[str, List[float]]]) -> None:
+        """Store embeddings as packed int8 bytes plus scale."""
+        if not items:
+            return
+        
+        pairs = await _in_pool(self._encode_cached, items)
+        
+        try:
+            cache = await get_redis_cache()
+            await cache.multi_set(pairs, ttl=_CACHE_TTL)
+        except Exception as e:
+            logger.warning("Embedding cache write failed", error=str(e))
+    
+    def _decode_cached(self, hits: List[Optional[bytes]]) -> List[Optional[List[float]]]:
+        """Unpack cached int8 embeddings; misses and malformed entries stay None."""
+        size = _SCALE_FORMAT.size + self.dimension
+        return [
+            dequantize_embedding(
+                np.frombuffer(hit, dtype=np.int8, offset=_SCALE_FORMAT.size),
+                _SCALE_FORMAT.unpack_from(hit)[0]
+            ).tolist()
+            if isinstance(hit, bytes) and len(hit) == size else None
+            for hit in hits
+        ]
+    
+    def _encode_cached(self, items: List[Tuple[str, List[float]]]) -> List[Tuple[str, bytes]]:
+        """Pack embeddings as the scale followed by the int8 values."""
+        pairs = []
+        for key, embedding in items:
+            q, scale = quantize_embedding(embedding)
+            pairs.append((key, _SCALE_FORMAT.pack(scale) + q.tobytes()))
+        return pairs
     
-    def _truncate_text(self, text: str) -> str:
-        """Truncate text to fit within token limits."""
+    def _pack(self, embeddings: List[List[float]]) -> np.ndarray:
+        """Pack embeddings into one contiguous float32 matrix."""
+        return np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dimension)
+    
+    def _truncate_text(self, text: str) -> Tuple[str, int]:
+        """Truncate text to fit within token limits.
+        
+        Returns the (possibly truncated) text and its token count.
+        """
         tokens = self.encoding.encode(text)
         
         if len(tokens) <= self.max_tokens:
-            return text
+            return text, len(tokens)
         
         # Truncate and decode
         truncated_tokens = tokens[:self.max_tokens]
-        return self.encoding.decode(truncated_tokens)
+        return self.encoding.decode(truncated_tokens), self.max_tokens
+    
+    def _truncate_batch(self, texts: List[str]) -> Tuple[List[str], int]:
+        """Truncate many texts at once using parallel tokenization.
+        
+        Returns the (possibly truncated) texts and their total token count.
+        """
+        tokens_list = self.encoding.encode_batch(texts, num_threads=os.cpu_count() or 1)
+        
+        truncated = []
+        token_count = 0
+        for text, tokens in zip(texts, tokens_list):
+            if len(tokens) > self.max_tokens:
+                text = self.encoding.decode(tokens[:self.max_tokens])
+            truncated.append(text)
+            token_count += min(len(tokens), self.max_tokens)
+        
+        return truncated, token_count
     
     def _create_concept_text(self, concept: Concept, chapter_title: str, section_title: str) -> str:
         """Create enriched text representation of concept for embedding."""
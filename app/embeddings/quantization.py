@@ -0,0 +1,28 @@
+"""Int8 quantization of embeddings.
+
+Kept free of the tokenizer and API client so storage code can import it cheaply.
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+
+def int8_scale(v: np.ndarray) -> float:
+    """Scale that maps the largest magnitude in ``v`` onto the int8 range."""
+    v = np.asarray(v, dtype=np.float32)
+    if not v.size:
+        return 1.0
+    return float(np.abs(v).max()) / 127 or 1.0
+
+
+def quantize_embedding(v: np.ndarray, scale: Optional[float] = None) -> Tuple[np.ndarray, float]:
+    """Quantize embeddings to int8, using a per-vector scale unless one is given."""
+    v = np.asarray(v, dtype=np.float32)
+    if scale is None:
+        scale = int8_scale(v)
+    return np.clip(np.round(v / scale), -127, 127).astype(np.int8), scale
+
+
+def dequantize_embedding(q: np.ndarray, scale: float) -> np.ndarray:
+    """Restore an approximate float32 embedding from its int8 form."""
+    return q.astype(np.float32) * np.float32(scale)
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""Rate limiting for OpenAI API calls."""
+
+import asyncio
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+
+class AsyncLeakyBucket:
+    """Coroutine-safe token bucket throttling by requests and tokens per minute."""
+
+    def __init__(self, rpm: int, tpm: Optional[int] = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests_available = float(rpm)
+        self._tokens_available = float(tpm) if tpm else 0.0
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Replenish capacity proportionally to the time elapsed."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+
+        self._requests_available = min(
+            self.rpm, self._requests_available + elapsed * self.rpm / 60
+        )
+        if self.tpm:
+            self._tokens_available = min(
+                self.tpm, self._tokens_available + elapsed * self.tpm / 60
+            )
+
+    async def acquire(self, tokens: int = 0, requests: int = 1) -> None:
+        """Wait until the requested capacity is available, then consume it."""
+        # A single call can never need more than a full minute of capacity
+        requests = min(requests, self.rpm)
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+
+        async with self._lock:
+            while True:
+                self._refill()
+
+                request_deficit = requests - self._requests_available
+                token_deficit = tokens - self._tokens_available if self.tpm else 0
+
+                if request_deficit <= 0 and token_deficit <= 0:
+                    self._requests_available -= requests
+                    if self.tpm:
+                        self._tokens_available -= tokens
+                    return
+
+                wait = max(
+                    request_deficit * 60 / self.rpm,
+                    token_deficit * 60 / self.tpm if self.tpm else 0
+                )
+                await asyncio.sleep(wait)
+
+
+# Shared limiter for all OpenAI requests made by this process
+limiter = AsyncLeakyBucket(
+    rpm=settings.OPENAI_RPM_LIMIT,
+    tpm=settings.OPENAI_TPM_LIMIT
+)
\ No newline at end of file
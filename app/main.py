@@ -1,24 +1,36 @@
 """Main FastAPI application for Content Service."""
 
 import os
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, AsyncExitStack
 from typing import Dict, Any
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from cachetools import TTLCache
 import structlog
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.core.dependencies import get_neo4j_client, get_pinecone_client
+from app.core.dependencies import get_neo4j_client, get_pinecone_client, get_openai_client, get_s3_client
+from app.core.read_cache import listen_for_invalidation
+from app.neo4j_client.graph_manager import GraphManager
+from app.embeddings.generator import EmbeddingGenerator
+from app.pinecone_client.vector_store import VectorStore
+from app.content_generation.hook_generator import HookGenerator
+from app.pdf_processing.extractor import PDFExtractor, create_pdf_pool
 from app.routers import content, graph, hooks, processing
 
 # Setup structured logging
 setup_logging()
 logger = structlog.get_logger()
 
+# Short-lived caches so frequent liveness probes don't hit the backends each time
+_health_cache: TTLCache = TTLCache(maxsize=1, ttl=5)
+_pinecone_stats_cache: TTLCache = TTLCache(maxsize=1, ttl=10)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -30,10 +42,31 @@ async def lifespan(app: FastAPI):
     neo4j_client = await get_neo4j_client()
     pinecone_client = await get_pinecone_client()
     
+    # Clients that live for the whole application lifetime
+    exit_stack = AsyncExitStack()
+    app.state.s3 = await exit_stack.enter_async_context(get_s3_client())
+    logger.info("S3 client initialized")
+    
     # Store in app state
     app.state.neo4j = neo4j_client
     app.state.pinecone = pinecone_client
     
+    # Request-path services, built once and shared by all handlers
+    app.state.embedding_gen = EmbeddingGenerator()
+    app.state.vector_store = VectorStore(pinecone_client)
+    app.state.hook_gen = HookGenerator()
+    
+    # Worker processes for PDF parsing, shut down with the app
+    app.state.pdf_pool = create_pdf_pool()
+    app.state.pdf_extractor = PDFExtractor(app.state.pdf_pool)
+    
+    # Shared graph manager; creates graph indexes once rather than on every ingest
+    app.state.graph_manager = GraphManager(neo4j_client)
+    await app.state.graph_manager.prepare()
+    
+    # Drop read caches whenever any worker finishes an ingest
+    cache_listener = asyncio.create_task(listen_for_invalidation())
+    
     # Setup Prometheus metrics
     if settings.ENABLE_METRICS:
         instrumentator = Instrumentator()
@@ -44,9 +77,25 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Spool Content Service")
     
+    cache_listener.cancel()
+    
     # Close connections
     if hasattr(app.state, "neo4j") and app.state.neo4j:
         await app.state.neo4j.close()
+    
+    if hasattr(app.state, "vector_store"):
+        await app.state.vector_store.fetcher.close()
+    
+    if hasattr(app.state, "pinecone") and app.state.pinecone:
+        await app.state.pinecone.close()
+    
+    await exit_stack.aclose()
+    
+    if hasattr(app.state, "pdf_pool"):
+        await asyncio.to_thread(app.state.pdf_pool.shutdown, cancel_futures=True)
+    
+    if get_openai_client.cache_info().currsize:
+        await get_openai_client().close()
 
 
 # Create FastAPI app
@@ -86,9 +135,25 @@ async def root():
     }
 
 
+async def _check_neo4j(driver) -> None:
+    """Verify Neo4j connectivity."""
+    await driver.verify_connectivity()
+
+
+async def _check_pinecone(index) -> None:
+    """Verify Pinecone with a lightweight stats call on the index in use."""
+    if "stats" not in _pinecone_stats_cache:
+        _pinecone_stats_cache["stats"] = await index.describe_index_stats()
+
+
 @app.get("/health", tags=["health"])
 async def health_check(request: Request):
     """Health check endpoint."""
+    cached = _health_cache.get("health")
+    if cached:
+        health_status, status_code = cached
+        return JSONResponse(content=health_status, status_code=status_code)
+    
     health_status = {
         "status": "healthy",
         "service": "content-service",
@@ -96,26 +161,24 @@ async def health_check(request: Request):
         "checks": {}
     }
     
-    # Check Neo4j
-    try:
-        if hasattr(request.app.state, "neo4j") and request.app.state.neo4j:
-            await request.app.state.neo4j.verify_connectivity()
-            health_status["checks"]["neo4j"] = "healthy"
-    except Exception as e:
-        health_status["checks"]["neo4j"] = f"unhealthy: {str(e)}"
-        health_status["status"] = "degraded"
-    
-    # Check Pinecone
-    try:
-        if hasattr(request.app.state, "pinecone") and request.app.state.pinecone:
-            # Simple health check - list indexes
-            request.app.state.pinecone.list_indexes()
-            health_status["checks"]["pinecone"] = "healthy"
-    except Exception as e:
-        health_status["checks"]["pinecone"] = f"unhealthy: {str(e)}"
-        health_status["status"] = "degraded"
+    # Check Neo4j and Pinecone concurrently
+    checks = {}
+    if hasattr(request.app.state, "neo4j") and request.app.state.neo4j:
+        checks["neo4j"] = _check_neo4j(request.app.state.neo4j)
+    if hasattr(request.app.state, "pinecone") and request.app.state.pinecone:
+        checks["pinecone"] = _check_pinecone(request.app.state.pinecone)
+    
+    results = await asyncio.gather(*checks.values(), return_exceptions=True)
+    
+    for name, result in zip(checks, results):
+        if isinstance(result, BaseException):
+            health_status["checks"][name] = f"unhealthy: {str(result)}"
+            health_status["status"] = "degraded"
+        else:
+            health_status["checks"][name] = "healthy"
     
     status_code = 200 if health_status["status"] == "healthy" else 503
+    _health_cache["health"] = (health_status, status_code)
     return JSONResponse(content=health_status, status_code=status_code)
 
 
@@ -143,10 +206,25 @@ async def get_config():
 if __name__ == "__main__":
     import uvicorn
     
+    # Prefer the C-accelerated loop and parser; uvloop is unavailable on Windows
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=settings.SERVICE_PORT,
+        loop=loop,
+        http=http,
         reload=settings.ENVIRONMENT == "development",
         log_config=None  # Use structlog instead
     )
\ No newline at end of file
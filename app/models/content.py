@@ -3,7 +3,8 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, field_serializer
+import numpy as np
 import uuid
 
 
@@ -30,9 +31,19 @@ class Concept(BaseModel):
     name: str
     content: str
     type: ContentType
-    embedding: Optional[List[float]] = None
+    embedding: Optional[Any] = None  # float32 ndarray
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
+    @field_validator("embedding", mode="before")
+    def parse_embedding(cls, v):
+        if v is None:
+            return v
+        return np.asarray(v, dtype=np.float32)
+    
+    @field_serializer("embedding")
+    def serialize_embedding(self, v):
+        return v.tolist() if v is not None else None
+    
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
@@ -67,6 +78,10 @@ class Book(BaseModel):
     s3_key: Optional[str] = None
     processed_at: Optional[datetime] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    # (n_concepts, dimension) float32 matrix backing each Concept.embedding
+    embeddings: Optional[Any] = Field(default=None, exclude=True)
+    # Concept ids parallel to the rows of ``embeddings``
+    concept_ids: Optional[Any] = Field(default=None, exclude=True)
 
 
 class ProcessingJob(BaseModel):
@@ -1,38 +1,190 @@
 """Neo4j graph operations for knowledge management."""
 
-from typing import List, Dict, Any, Optional, Tuple
-from neo4j import AsyncGraphDatabase
+from typing import List, Dict, Any, Optional, Tuple, ClassVar
+import asyncio
+from neo4j import AsyncGraphDatabase, RoutingControl, unit_of_work
+from neo4j.exceptions import ClientError
 import structlog
 
-from app.models.content import Book, Chapter, Section, Concept, ConceptGraph, GraphNode, LearningPath
+from app.models.content import Book, Section, Concept, ConceptGraph, GraphNode, LearningPath
 from app.core.config import settings
+from app.core.read_cache import new_cache
 
 logger = structlog.get_logger()
 
+# Schema required by the graph queries; the Concept id constraint also
+# provides the unique index used for seeks
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS FOR (b:Book) ON (b.id)",
+    "CREATE INDEX IF NOT EXISTS FOR (c:Chapter) ON (c.id)",
+    "CREATE INDEX IF NOT EXISTS FOR (s:Section) ON (s.id)",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (co:Concept) REQUIRE co.id IS UNIQUE",
+    "CREATE INDEX IF NOT EXISTS FOR (co:Concept) ON (co.name)"
+]
+
+# Plain Concept.id index created before the unique constraint replaced it
+LEGACY_CONCEPT_INDEX_QUERY = """
+SHOW INDEXES YIELD name, type, labelsOrTypes, properties, owningConstraint
+WHERE type = 'RANGE'
+  AND labelsOrTypes = ['Concept']
+  AND properties = ['id']
+  AND owningConstraint IS NULL
+RETURN name
+"""
+
+# The only schema error that is safe to ignore at startup
+EQUIVALENT_SCHEMA_EXISTS = "Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists"
+
+# Upper bound on prerequisite hops searched for a learning path
+MAX_PATH_HOPS = 20
+
+# Creates one prerequisite edge from a ``pair`` row
+PREREQUISITE_MERGE = """
+MATCH (c1:Concept {id: pair.from_id})
+MATCH (c2:Concept {id: pair.to_id})
+MERGE (c1)-[:PREREQUISITE]->(c2)
+"""
+
+# APOC procedures the graph queries use when the plugin is installed
+APOC_PROCEDURES = ["apoc.periodic.iterate", "apoc.path.subgraphNodes"]
+
+# Read-through caches for traversal results, shared by all GraphManager instances
+_concept_graph_cache = new_cache(maxsize=4096, ttl=600)
+_learning_path_cache = new_cache(maxsize=4096, ttl=600)
+
+
+async def bootstrap(driver: AsyncGraphDatabase.driver) -> None:
+    """Ensure necessary indexes exist; run once at application startup."""
+    async def _run(query: str) -> None:
+        try:
+            await driver.execute_query(query, database_=settings.NEO4J_DATABASE)
+        except ClientError as e:
+            if e.code != EQUIVALENT_SCHEMA_EXISTS:
+                raise
+            logger.info("Schema statement already applied", query=query)
+    
+    # The unique constraint can't be created while a plain index covers
+    # Concept.id, so drop the index left by earlier releases first
+    records, _, _ = await driver.execute_query(
+        LEGACY_CONCEPT_INDEX_QUERY,
+        database_=settings.NEO4J_DATABASE
+    )
+    for record in records:
+        name = record["name"].replace("`", "``")
+        await driver.execute_query(
+            f"DROP INDEX `{name}` IF EXISTS",
+            database_=settings.NEO4J_DATABASE
+        )
+        logger.info("Dropped legacy Concept id index", name=record["name"])
+    
+    await asyncio.gather(*(_run(query) for query in INDEXES))
+    logger.info("Neo4j indexes ensured", count=len(INDEXES))
+
+
+async def detect_apoc(driver: AsyncGraphDatabase.driver) -> bool:
+    """Return whether every procedure in APOC_PROCEDURES is installed."""
+    try:
+        records, _, _ = await driver.execute_query(
+            "SHOW PROCEDURES YIELD name WHERE name IN $names RETURN name",
+            names=APOC_PROCEDURES,
+            routing_=RoutingControl.READ,
+            database_=settings.NEO4J_DATABASE
+        )
+    except ClientError as e:
+        logger.warning("APOC detection failed", error=str(e))
+        return False
+    
+    has_apoc = {record["name"] for record in records} >= set(APOC_PROCEDURES)
+    logger.info("APOC detection finished", has_apoc=has_apoc)
+    return has_apoc
+
 
 class GraphManager:
     """Manage knowledge graph in Neo4j."""
     
+    # Cypher is built once per class rather than on every call
+    _BOOK_QUERY: ClassVar[str] = """
+        MERGE (b:Book {id: $book_id})
+        SET b.title = $title,
+            b.subject = $subject,
+            b.grade_level = $grade_level,
+            b.processed_at = datetime($processed_at)
+        """
+    
+    _CHAPTER_QUERY: ClassVar[str] = """
+        MATCH (b:Book {id: $book_id})
+        UNWIND $rows AS row
+        MERGE (c:Chapter {id: row.chapter_id})
+        SET c.number = row.number,
+            c.title = row.title
+        MERGE (b)-[:HAS_CHAPTER]->(c)
+        """
+    
+    _SECTION_QUERY: ClassVar[str] = """
+        UNWIND $rows AS row
+        MATCH (c:Chapter {id: row.chapter_id})
+        MERGE (s:Section {id: row.section_id})
+        SET s.title = row.title,
+            s.number = row.number
+        MERGE (c)-[:HAS_SECTION]->(s)
+        """
+    
+    _CONCEPT_QUERY: ClassVar[str] = """
+        UNWIND $rows AS row
+        MATCH (s:Section {id: row.section_id})
+        MERGE (co:Concept {id: row.concept_id})
+        SET co.name = row.name,
+            co.type = row.type,
+            co.content = row.content
+        MERGE (s)-[:HAS_CONCEPT]->(co)
+        """
+    
+    _PREREQUISITE_ITERATE_QUERY: ClassVar[str] = """
+        CALL apoc.periodic.iterate($outer, $inner, {batchSize: 1000, params: {pairs: $pairs}})
+        YIELD failedBatches, errorMessages
+        RETURN failedBatches, errorMessages
+        """
+    
+    _PREREQUISITE_UNWIND_QUERY: ClassVar[str] = "UNWIND $pairs AS pair\n" + PREREQUISITE_MERGE
+    
+    # Locate the concept once and collect each neighborhood from it.
+    # Pattern comprehensions avoid the row blow-up of chained OPTIONAL MATCHes.
+    _CONCEPT_GRAPH_QUERY: ClassVar[str] = """
+        MATCH (c:Concept {id: $concept_id})
+        RETURN c,
+               [(c)<-[:PREREQUISITE]-(p:Concept) | p] AS prerequisites,
+               [(c)-[:RELATED_TO]-(r:Concept) | r] AS related,
+               [(c)-[:PREREQUISITE]->(n:Concept) | n] AS next_concepts
+        """
+    
+    _SHORTEST_PATH_QUERY: ClassVar[str] = f"""
+        MATCH (from:Concept {{id: $from_id}}), (to:Concept {{id: $to_id}})
+        USING INDEX from:Concept(id)
+        USING INDEX to:Concept(id)
+        MATCH path = shortestPath((from)-[:PREREQUISITE*..{MAX_PATH_HOPS}]->(to))
+        RETURN from, to, nodes(path) as path_nodes, length(path) as path_length
+        """
+    
     def __init__(self, driver: AsyncGraphDatabase.driver):
         self.driver = driver
         self.database = settings.NEO4J_DATABASE
+        self.has_apoc = False
+    
+    async def prepare(self) -> None:
+        """Ensure the schema the queries rely on and detect APOC; call once at startup."""
+        await bootstrap(self.driver)
+        self.has_apoc = await detect_apoc(self.driver)
     
     async def create_book_graph(self, book: Book) -> None:
         """Create graph structure for a book."""
         async with self.driver.session(database=self.database) as session:
             try:
-                # Create book node
-                await session.execute_write(self._create_book_node, book)
-                
-                # Create hierarchical structure
-                for chapter in book.chapters:
-                    await session.execute_write(self._create_chapter_structure, book.book_id, chapter)
-                
-                # Create concept relationships
-                await self._create_concept_relationships(session, book)
+                # Write the whole book structure in a single transaction
+                pairs = await session.execute_write(self._create_book_structure, book)
                 
-                # Create indexes
-                await self._ensure_indexes(session)
+                # Prerequisite edges are committed in batches once the concepts exist
+                await self._create_prerequisites(session, pairs)
+                self.invalidate_book(book.book_id)
                 
                 logger.info(
                     "Book graph created",
@@ -44,118 +196,102 @@ class GraphManager:
                 logger.error("Failed to create book graph", error=str(e))
                 raise
     
-    async def _create_book_node(self, tx, book: Book):
-        """Create book node."""
-        query = """
-        MERGE (b:Book {id: $book_id})
-        SET b.title = $title,
-            b.subject = $subject,
-            b.grade_level = $grade_level,
-            b.processed_at = datetime($processed_at)
-        """
-        tx.run(
-            query,
-            book_id=book.book_id,
-            title=book.title,
-            subject=book.subject,
-            grade_level=book.grade_level,
-            processed_at=book.processed_at.isoformat() if book.processed_at else None
-        )
-    
-    async def _create_chapter_structure(self, tx, book_id: str, chapter: Chapter):
-        """Create chapter and its sections."""
-        # Create chapter
-        chapter_query = """
-        MATCH (b:Book {id: $book_id})
-        MERGE (c:Chapter {id: $chapter_id})
-        SET c.number = $number,
-            c.title = $title
-        MERGE (b)-[:HAS_CHAPTER]->(c)
-        """
-        tx.run(
-            chapter_query,
-            book_id=book_id,
-            chapter_id=chapter.chapter_id,
-            number=chapter.number,
-            title=chapter.title
-        )
+    def invalidate_book(self, book_id: str) -> None:
+        """Drop cached traversals after a book's graph changes.
         
-        # Create sections and concepts
-        for section in chapter.sections:
-            section_query = """
-            MATCH (c:Chapter {id: $chapter_id})
-            MERGE (s:Section {id: $section_id})
-            SET s.title = $title,
-                s.number = $number
-            MERGE (c)-[:HAS_SECTION]->(s)
-            """
-            tx.run(
-                section_query,
-                chapter_id=chapter.chapter_id,
-                section_id=section.section_id,
-                title=section.title,
-                number=section.number
-            )
-            
-            # Create concepts
-            for concept in section.concepts:
-                concept_query = """
-                MATCH (s:Section {id: $section_id})
-                MERGE (co:Concept {id: $concept_id})
-                SET co.name = $name,
-                    co.type = $type,
-                    co.content = $content
-                MERGE (s)-[:HAS_CONCEPT]->(co)
-                """
-                tx.run(
-                    concept_query,
-                    section_id=section.section_id,
-                    concept_id=concept.concept_id,
-                    name=concept.name,
-                    type=concept.type.value,
-                    content=concept.content[:1000]  # Limit content size
-                )
+        Prerequisite chains can span books, so every cached result is cleared
+        rather than only those touching ``book_id``.
+        """
+        _concept_graph_cache.clear()
+        _learning_path_cache.clear()
+        logger.debug("Graph caches invalidated", book_id=book_id)
     
-    async def _create_concept_relationships(self, session, book: Book):
-        """Create relationships between concepts."""
-        # This is a simplified version - in production, you'd use NLP to identify relationships
-        concepts = []
+    async def _create_book_structure(self, tx, book: Book):
+        """Create book, chapters, sections, concepts and their relationships."""
+        # Flatten the hierarchy into one row list per level
+        chapter_rows = []
+        section_rows = []
+        concept_rows = []
         for chapter in book.chapters:
+            chapter_rows.append({
+                "chapter_id": chapter.chapter_id,
+                "number": chapter.number,
+                "title": chapter.title
+            })
             for section in chapter.sections:
-                concepts.extend(section.concepts)
+                section_rows.append({
+                    "chapter_id": chapter.chapter_id,
+                    "section_id": section.section_id,
+                    "title": section.title,
+                    "number": section.number
+                })
+                for concept in section.concepts:
+                    concept_rows.append({
+                        "section_id": section.section_id,
+                        "concept_id": concept.concept_id,
+                        "name": concept.name,
+                        "type": concept.type.value,
+                        "content": concept.content[:1000]  # Limit content size
+                    })
         
         # Create prerequisite relationships based on order
-        for i in range(len(concepts) - 1):
-            await session.execute_write(
-                self._create_prerequisite_relation,
-                concepts[i].concept_id,
-                concepts[i + 1].concept_id
+        # This is a simplified version - in production, you'd use NLP to identify relationships
+        pairs = [
+            {"from_id": a["concept_id"], "to_id": b["concept_id"]}
+            for a, b in zip(concept_rows, concept_rows[1:])
+        ]
+        
+        await self._create_book_node(tx, book)
+        
+        await tx.run(self._CHAPTER_QUERY, book_id=book.book_id, rows=chapter_rows)
+        await tx.run(self._SECTION_QUERY, rows=section_rows)
+        await tx.run(self._CONCEPT_QUERY, rows=concept_rows)
+        
+        return pairs
+    
+    async def _create_prerequisites(self, session, pairs: List[Dict[str, str]]) -> None:
+        """Create prerequisite relationships, committing 1000 edges per transaction when APOC is available."""
+        if not pairs:
+            return
+        
+        if not self.has_apoc:
+            # Without APOC, write every edge in a single UNWIND transaction
+            await session.execute_write(self._create_prerequisites_unwind, pairs)
+            return
+        
+        cursor = await session.run(
+            self._PREREQUISITE_ITERATE_QUERY,
+            outer="UNWIND $pairs AS pair RETURN pair",
+            inner=PREREQUISITE_MERGE,
+            pairs=pairs
+        )
+        record = await cursor.single()
+        if record and record["failedBatches"]:
+            raise RuntimeError(
+                f"Prerequisite batches failed: {record['errorMessages']}"
             )
     
-    async def _create_prerequisite_relation(self, tx, from_id: str, to_id: str):
-        """Create prerequisite relationship."""
-        query = """
-        MATCH (c1:Concept {id: $from_id})
-        MATCH (c2:Concept {id: $to_id})
-        MERGE (c1)-[:PREREQUISITE]->(c2)
-        """
-        tx.run(query, from_id=from_id, to_id=to_id)
+    async def _create_prerequisites_unwind(self, tx, pairs: List[Dict[str, str]]):
+        """Create prerequisite relationships in the current transaction."""
+        await tx.run(self._PREREQUISITE_UNWIND_QUERY, pairs=pairs)
     
-    async def _ensure_indexes(self, session):
-        """Ensure necessary indexes exist."""
-        indexes = [
-            "CREATE INDEX IF NOT EXISTS FOR (b:Book) ON (b.id)",
-            "CREATE INDEX IF NOT EXISTS FOR (c:Chapter) ON (c.id)",
-            "CREATE INDEX IF NOT EXISTS FOR (s:Section) ON (s.id)",
-            "CREATE INDEX IF NOT EXISTS FOR (co:Concept) ON (co.id)",
-            "CREATE INDEX IF NOT EXISTS FOR (co:Concept) ON (co.name)"
-        ]
-        
-        for index_query in indexes:
-            await session.run(index_query)
+    async def _create_book_node(self, tx, book: Book):
+        """Create book node."""
+        await tx.run(
+            self._BOOK_QUERY,
+            book_id=book.book_id,
+            title=book.title,
+            subject=book.subject,
+            grade_level=book.grade_level,
+            processed_at=book.processed_at.isoformat() if book.processed_at else None
+        )
     
     async def get_concept_graph(self, concept_id: str) -> Optional[ConceptGraph]:
         """Get concept with all its relationships."""
+        cached = _concept_graph_cache.get(concept_id)
+        if cached is not None:
+            return cached
+        
         async with self.driver.session(database=self.database) as session:
             try:
                 result = await session.execute_read(
@@ -164,85 +300,46 @@ class GraphManager:
                 )
                 
                 if result:
-                    return ConceptGraph(**result)
+                    concept_graph = ConceptGraph(**result)
+                    _concept_graph_cache[concept_id] = concept_graph
+                    return concept_graph
                 return None
                 
             except Exception as e:
                 logger.error("Failed to get concept graph", error=str(e))
                 raise
     
+    @unit_of_work(timeout=settings.NEO4J_QUERY_TIMEOUT)
     async def _get_concept_with_relationships(self, tx, concept_id: str):
         """Query concept with relationships."""
-        # Get concept
-        concept_query = """
-        MATCH (c:Concept {id: $concept_id})
-        RETURN c
-        """
-        concept_result = tx.run(concept_query, concept_id=concept_id).single()
+        cursor = await tx.run(self._CONCEPT_GRAPH_QUERY, concept_id=concept_id)
+        record = await cursor.single()
         
-        if not concept_result:
+        if not record:
             return None
         
-        concept_node = GraphNode(
-            id=concept_result["c"]["id"],
-            label="Concept",
-            properties=dict(concept_result["c"])
-        )
-        
-        # Get prerequisites
-        prereq_query = """
-        MATCH (c:Concept {id: $concept_id})<-[:PREREQUISITE]-(p:Concept)
-        RETURN p
-        """
-        prereq_results = tx.run(prereq_query, concept_id=concept_id)
-        prerequisites = [
-            GraphNode(
-                id=record["p"]["id"],
-                label="Concept",
-                properties=dict(record["p"])
-            )
-            for record in prereq_results
-        ]
-        
-        # Get related concepts
-        related_query = """
-        MATCH (c:Concept {id: $concept_id})-[:RELATED_TO]-(r:Concept)
-        RETURN r
-        """
-        related_results = tx.run(related_query, concept_id=concept_id)
-        related = [
-            GraphNode(
-                id=record["r"]["id"],
-                label="Concept",
-                properties=dict(record["r"])
-            )
-            for record in related_results
-        ]
-        
-        # Get next concepts
-        next_query = """
-        MATCH (c:Concept {id: $concept_id})-[:PREREQUISITE]->(n:Concept)
-        RETURN n
-        """
-        next_results = tx.run(next_query, concept_id=concept_id)
-        next_concepts = [
-            GraphNode(
-                id=record["n"]["id"],
-                label="Concept",
-                properties=dict(record["n"])
-            )
-            for record in next_results
-        ]
-        
         return {
-            "concept": concept_node,
-            "prerequisites": prerequisites,
-            "related_concepts": related,
-            "next_concepts": next_concepts
+            "concept": self._to_graph_node(record["c"]),
+            "prerequisites": [self._to_graph_node(node) for node in record["prerequisites"]],
+            "related_concepts": [self._to_graph_node(node) for node in record["related"]],
+            "next_concepts": [self._to_graph_node(node) for node in record["next_concepts"]]
         }
     
+    def _to_graph_node(self, node) -> GraphNode:
+        """Convert a Neo4j concept node to a GraphNode."""
+        return GraphNode(
+            id=node["id"],
+            label="Concept",
+            properties=dict(node)
+        )
+    
     async def find_learning_path(self, from_concept_id: str, to_concept_id: str) -> Optional[LearningPath]:
         """Find shortest learning path between two concepts."""
+        key = (from_concept_id, to_concept_id)
+        cached = _learning_path_cache.get(key)
+        if cached is not None:
+            return cached
+        
         async with self.driver.session(database=self.database) as session:
             try:
                 result = await session.execute_read(
@@ -252,33 +349,23 @@ class GraphManager:
                 )
                 
                 if result:
-                    return LearningPath(**result)
+                    learning_path = LearningPath(**result)
+                    _learning_path_cache[key] = learning_path
+                    return learning_path
                 return None
                 
             except Exception as e:
                 logger.error("Failed to find learning path", error=str(e))
                 raise
     
+    @unit_of_work(timeout=settings.NEO4J_QUERY_TIMEOUT)
     async def _find_shortest_path(self, tx, from_id: str, to_id: str):
         """Find shortest path using prerequisite relationships."""
-        query = """
-        MATCH path = shortestPath(
-            (from:Concept {id: $from_id})-[:PREREQUISITE*]->(to:Concept {id: $to_id})
-        )
-        RETURN from, to, nodes(path) as path_nodes, length(path) as path_length
-        """
-        
-        result = tx.run(query, from_id=from_id, to_id=to_id).single()
+        cursor = await tx.run(self._SHORTEST_PATH_QUERY, from_id=from_id, to_id=to_id)
+        result = await cursor.single()
         
         if result:
-            path_nodes = [
-                GraphNode(
-                    id=node["id"],
-                    label="Concept",
-                    properties=dict(node)
-                )
-                for node in result["path_nodes"]
-            ]
+            path_nodes = [self._to_graph_node(node) for node in result["path_nodes"]]
             
             return {
                 "from_concept": from_id,
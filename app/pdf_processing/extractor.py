@@ -1,46 +1,111 @@
 """PDF text extraction and structuring."""
 
+import asyncio
+import multiprocessing
 import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 import PyPDF2
 import pdfplumber
+import pypdfium2 as pdfium
 from io import BytesIO
 import structlog
 
 from app.models.content import Book, Chapter, Section, Concept, ContentType
+from app.core.config import settings
 
 logger = structlog.get_logger()
 
 
+def create_pdf_pool() -> ProcessPoolExecutor:
+    """Create the worker pool for CPU-bound PDF parsing; owned by the app lifespan.
+    
+    Workers come from a forkserver rather than being forked from the
+    multi-threaded app process, which can deadlock on locks held at fork time.
+    """
+    return ProcessPoolExecutor(
+        max_workers=settings.PDF_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver")
+    )
+
+
+def _extract_sync(pdf_bytes: bytes, title: str, extract_tables: bool = False) -> Dict[str, Any]:
+    """Worker entry point; returns a plain dict so the result pickles cheaply."""
+    return PDFExtractor().extract_sync(pdf_bytes, title, extract_tables).model_dump()
+
+
+def _extract_file_sync(path: str, title: str, extract_tables: bool = False) -> Dict[str, Any]:
+    """Worker entry point that reads the PDF itself, so the bytes never cross processes."""
+    with open(path, "rb") as f:
+        pdf_bytes = f.read()
+    return _extract_sync(pdf_bytes, title, extract_tables)
+
+
 class PDFExtractor:
-    """Extract and structure content from PDF files."""
-    
-    def __init__(self):
-        self.chapter_patterns = [
-            r"^Chapter\s+(\d+)[:\s]+(.+)$",
-            r"^CHAPTER\s+(\d+)[:\s]+(.+)$",
-            r"^Unit\s+(\d+)[:\s]+(.+)$",
-            r"^Module\s+(\d+)[:\s]+(.+)$",
-            r"^(\d+)\.\s+(.+)$"  # Simple numbered chapters
-        ]
-        
-        self.section_patterns = [
-            r"^(\d+\.\d+)\s+(.+)$",
-            r"^Section\s+(\d+\.\d+)[:\s]+(.+)$",
-            r"^[A-Z]\.\s+(.+)$"
-        ]
-    
-    async def extract_from_bytes(self, pdf_bytes: bytes, title: str) -> Book:
-        """Extract content from PDF bytes."""
+    """Extract and structure content from PDF files.
+    
+    Async extraction runs in ``pool``, or in the loop's default executor
+    when none is given.
+    """
+    
+    def __init__(self, pool: Optional[Executor] = None):
+        self.pool = pool
+        
+        # Alternatives are tried in order, so the first listed pattern wins
+        self._chapter_re = re.compile(
+            r"^(?:(?:chapter|unit|module)\s+(\d+)[:\s]+(.+)"
+            r"|(\d+)\.\s+(.+))$",  # Simple numbered chapters
+            re.IGNORECASE
+        )
+        
+        self._section_re = re.compile(
+            r"^(?:(\d+\.\d+)\s+(.+)"
+            r"|section\s+(\d+\.\d+)[:\s]+(.+)"
+            r"|[A-Z]\.\s+(.+))$",
+            re.IGNORECASE
+        )
+        
+        # Content type keywords, one named group per ContentType
+        self._classifier = re.compile(
+            r"(?P<EXAMPLE>example:|for instance|e\.g\.|such as)"
+            r"|(?P<FORMULA>=|formula|equation)"
+            r"|(?P<EXERCISE>exercise:|problem:|question:)"
+            r"|(?P<DEFINITION>definition:|is defined as|means that)",
+            re.IGNORECASE
+        )
+    
+    async def extract_from_bytes(
+        self,
+        pdf_bytes: bytes,
+        title: str,
+        extract_tables: bool = False
+    ) -> Book:
+        """Extract content from PDF bytes.
+        
+        Table detection is expensive and unused by structuring, so it only
+        runs when ``extract_tables`` is set.
+        """
+        return await self._extract_in_pool(_extract_sync, pdf_bytes, title, extract_tables)
+    
+    async def extract_from_path(
+        self,
+        path: str,
+        title: str,
+        extract_tables: bool = False
+    ) -> Book:
+        """Extract content from a PDF file on disk."""
+        return await self._extract_in_pool(_extract_file_sync, path, title, extract_tables)
+    
+    async def _extract_in_pool(self, worker, source, title: str, extract_tables: bool) -> Book:
+        """Run an extraction worker in the process pool and build the Book."""
         try:
-            # Try pdfplumber first for better text extraction
-            content = await self._extract_with_pdfplumber(pdf_bytes)
-            if not content:
-                # Fallback to PyPDF2
-                content = await self._extract_with_pypdf2(pdf_bytes)
-            
-            # Structure the content
-            book = await self._structure_content(content, title)
+            # Parsing is CPU-bound; run it in a worker process off the event loop
+            loop = asyncio.get_running_loop()
+            payload = await loop.run_in_executor(
+                self.pool, worker, source, title, extract_tables
+            )
+            book = Book(**payload)
             
             logger.info(
                 "PDF extraction completed",
@@ -59,7 +124,51 @@ class PDFExtractor:
             logger.error("PDF extraction failed", error=str(e), title=title)
             raise
     
-    async def _extract_with_pdfplumber(self, pdf_bytes: bytes) -> List[Dict[str, Any]]:
+    def extract_sync(self, pdf_bytes: bytes, title: str, extract_tables: bool = False) -> Book:
+        """Extract content from PDF bytes in the calling process."""
+        # PDFium is much faster for plain text; pdfplumber is needed for tables
+        content = [] if extract_tables else self._extract_with_pdfium(pdf_bytes)
+        if not content:
+            # Fallback to pdfplumber for PDFs PDFium yields no text for
+            content = self._extract_with_pdfplumber(pdf_bytes, extract_tables)
+        if not content:
+            # Fallback to PyPDF2
+            content = self._extract_with_pypdf2(pdf_bytes)
+        
+        # Structure the content
+        return self._structure_content(content, title)
+    
+    def _extract_with_pdfium(self, pdf_bytes: bytes) -> List[Dict[str, Any]]:
+        """Extract text using pypdfium2."""
+        pages = []
+        
+        try:
+            pdf = pdfium.PdfDocument(pdf_bytes)
+            try:
+                for i, page in enumerate(pdf):
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_bounded()
+                    textpage.close()
+                    page.close()
+                    
+                    if text.strip():
+                        pages.append({
+                            "page_num": i + 1,
+                            "text": text
+                        })
+            finally:
+                pdf.close()
+            
+            return pages
+        except Exception as e:
+            logger.warning(f"pypdfium2 extraction failed: {e}")
+            return []
+    
+    def _extract_with_pdfplumber(
+        self,
+        pdf_bytes: bytes,
+        extract_tables: bool = False
+    ) -> List[Dict[str, Any]]:
         """Extract text using pdfplumber."""
         pages = []
         
@@ -68,18 +177,20 @@ class PDFExtractor:
                 for i, page in enumerate(pdf.pages):
                     text = page.extract_text()
                     if text:
-                        pages.append({
+                        page_data = {
                             "page_num": i + 1,
-                            "text": text,
-                            "tables": page.extract_tables()
-                        })
+                            "text": text
+                        }
+                        if extract_tables:
+                            page_data["tables"] = page.extract_tables()
+                        pages.append(page_data)
             
             return pages
         except Exception as e:
             logger.warning(f"pdfplumber extraction failed: {e}")
             return []
     
-    async def _extract_with_pypdf2(self, pdf_bytes: bytes) -> List[Dict[str, Any]]:
+    def _extract_with_pypdf2(self, pdf_bytes: bytes) -> List[Dict[str, Any]]:
         """Extract text using PyPDF2 as fallback."""
         pages = []
         
@@ -91,8 +202,7 @@ class PDFExtractor:
                 if text:
                     pages.append({
                         "page_num": i + 1,
-                        "text": text,
-                        "tables": []
+                        "text": text
                     })
             
             return pages
@@ -100,18 +210,17 @@ class PDFExtractor:
             logger.error(f"PyPDF2 extraction failed: {e}")
             raise
     
-    async def _structure_content(self, pages: List[Dict[str, Any]], title: str) -> Book:
+    def _structure_content(self, pages: List[Dict[str, Any]], title: str) -> Book:
         """Structure extracted content into chapters and sections."""
         book = Book(title=title, subject=self._infer_subject(title))
         
         current_chapter = None
         current_section = None
-        accumulated_text = []
+        accumulated_text: List[str] = []
         
         for page in pages:
-            lines = page["text"].split('\n')
-            
-            for line in lines:
+            # splitlines() also handles the \r\n breaks PDFium emits
+            for line in page["text"].splitlines():
                 line = line.strip()
                 if not line:
                     continue
@@ -121,11 +230,10 @@ class PDFExtractor:
                 if chapter_match:
                     # Save accumulated text to previous section
                     if current_section and accumulated_text:
-                        concepts = await self._extract_concepts(
-                            '\n'.join(accumulated_text)
+                        current_section.concepts.extend(
+                            self._extract_concepts("\n".join(accumulated_text))
                         )
-                        current_section.concepts.extend(concepts)
-                        accumulated_text = []
+                        accumulated_text.clear()
                     
                     # Create new chapter
                     chapter_num, chapter_title = chapter_match
@@ -137,16 +245,15 @@ class PDFExtractor:
                     current_section = None
                     continue
                 
-                # Check for section
-                section_match = self._match_section(line)
-                if section_match and current_chapter:
+                # Check for section (only meaningful inside a chapter)
+                section_match = current_chapter and self._match_section(line)
+                if section_match:
                     # Save accumulated text to previous section
                     if current_section and accumulated_text:
-                        concepts = await self._extract_concepts(
-                            '\n'.join(accumulated_text)
+                        current_section.concepts.extend(
+                            self._extract_concepts("\n".join(accumulated_text))
                         )
-                        current_section.concepts.extend(concepts)
-                        accumulated_text = []
+                        accumulated_text.clear()
                     
                     # Create new section
                     section_num, section_title = section_match
@@ -162,41 +269,42 @@ class PDFExtractor:
         
         # Handle remaining text
         if current_section and accumulated_text:
-            concepts = await self._extract_concepts('\n'.join(accumulated_text))
-            current_section.concepts.extend(concepts)
+            current_section.concepts.extend(
+                self._extract_concepts("\n".join(accumulated_text))
+            )
         
         return book
     
     def _match_chapter(self, line: str) -> Optional[Tuple[int, str]]:
         """Match chapter patterns."""
-        for pattern in self.chapter_patterns:
-            match = re.match(pattern, line, re.IGNORECASE)
-            if match:
-                try:
-                    return int(match.group(1)), match.group(2).strip()
-                except:
-                    pass
-        return None
+        match = self._chapter_re.match(line)
+        if not match:
+            return None
+        
+        if match.group(1):
+            return int(match.group(1)), match.group(2).strip()
+        return int(match.group(3)), match.group(4).strip()
     
     def _match_section(self, line: str) -> Optional[Tuple[str, str]]:
         """Match section patterns."""
-        for pattern in self.section_patterns:
-            match = re.match(pattern, line, re.IGNORECASE)
-            if match:
-                if len(match.groups()) == 2:
-                    return match.group(1), match.group(2).strip()
-                else:
-                    return "A", match.group(1).strip()
-        return None
-    
-    async def _extract_concepts(self, text: str) -> List[Concept]:
+        match = self._section_re.match(line)
+        if not match:
+            return None
+        
+        if match.group(1):
+            return match.group(1), match.group(2).strip()
+        if match.group(3):
+            return match.group(3), match.group(4).strip()
+        return "A", match.group(5).strip()
+    
+    def _extract_concepts(self, text: str) -> List[Concept]:
         """Extract individual concepts from text."""
         concepts = []
         
         # Split into paragraphs
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        
-        for para in paragraphs:
+        for para in text.split('\n\n'):
+            para = para.strip()
+            
             # Skip very short paragraphs
             if len(para) < 50:
                 continue
@@ -205,8 +313,8 @@ class PDFExtractor:
             content_type = self._classify_content(para)
             
             # Extract concept name (first sentence or heading)
-            sentences = para.split('. ')
-            name = sentences[0][:100] if sentences else para[:100]
+            end = para.find('. ')
+            name = para[:end][:100] if end != -1 else para[:100]
             
             concept = Concept(
                 name=name,
@@ -219,20 +327,22 @@ class PDFExtractor:
     
     def _classify_content(self, text: str) -> ContentType:
         """Classify the type of content."""
-        text_lower = text.lower()
-        
-        if any(keyword in text_lower for keyword in ["example:", "for instance", "e.g.", "such as"]):
-            return ContentType.EXAMPLE
-        elif any(keyword in text_lower for keyword in ["=", "formula", "equation"]):
-            return ContentType.FORMULA
-        elif any(keyword in text_lower for keyword in ["exercise:", "problem:", "question:"]):
-            return ContentType.EXERCISE
-        elif any(keyword in text_lower for keyword in ["definition:", "is defined as", "means that"]):
-            return ContentType.DEFINITION
-        else:
-            return ContentType.EXPLANATION
+        # One scan collects every keyword category; categories keep their
+        # original priority regardless of where in the text they occur
+        found = set()
+        for match in self._classifier.finditer(text):
+            if match.lastgroup == "EXAMPLE":
+                return ContentType.EXAMPLE
+            found.add(match.lastgroup)
+        
+        for name in ("FORMULA", "EXERCISE", "DEFINITION"):
+            if name in found:
+                return ContentType[name]
+        return ContentType.EXPLANATION
     
-    def _infer_subject(self, title: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _infer_subject(title: str) -> str:
         """Infer subject from book title."""
         title_lower = title.lower()
         
@@ -245,4 +355,4 @@ class PDFExtractor:
         elif any(word in title_lower for word in ["english", "literature", "language"]):
             return "English"
         else:
-            return "General"
\ No newline at end of file
+            return "General"
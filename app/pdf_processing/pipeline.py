@@ -0,0 +1,137 @@
+"""Staged ingest pipeline: extraction, embeddings, graph and vector writes."""
+
+from typing import Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import numpy as np
+import structlog
+
+from app.models.content import Book, Chapter
+from app.pdf_processing.extractor import PDFExtractor
+from app.core.config import settings
+from app.embeddings.generator import EmbeddingGenerator
+from app.embeddings.quantization import int8_scale
+from app.neo4j_client.graph_manager import GraphManager
+from app.pinecone_client.vector_store import VectorStore
+
+logger = structlog.get_logger()
+
+# Chapters embedded ahead of the vector upserter before backpressure applies
+QUEUE_SIZE = 4
+
+
+async def ingest(
+    pdf_path: str,
+    title: str,
+    pdf_extractor: PDFExtractor,
+    graph_manager: GraphManager,
+    vector_store: VectorStore,
+    embedding_gen: EmbeddingGenerator,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None
+) -> Book:
+    """Extract a PDF and load it into Neo4j and Pinecone.
+    
+    After extraction the graph write runs alongside embedding. Chapters are
+    embedded concurrently and each is upserted to Pinecone as soon as its
+    embeddings are ready, so wall time tracks the slowest stage rather than
+    the sum of all of them.
+    """
+    # Two stage counters merged into one percentage: extraction is 25%,
+    # vector upserts 60% (per chapter) and the graph write the last 10%
+    chapters_stored = 0
+    graph_written = False
+    
+    async def _progress(percent: int) -> None:
+        if on_progress:
+            await on_progress(percent)
+    
+    async def _stage_progress() -> None:
+        vector_share = 60 * chapters_stored // max(len(book.chapters), 1)
+        await _progress(25 + vector_share + (10 if graph_written else 0))
+    
+    # Extract content
+    book = await pdf_extractor.extract_from_path(pdf_path, title)
+    await _progress(25)
+    
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    # Per-chapter (concept ids, matrix), kept in book order
+    embedded: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(book.chapters)
+    embedding_scale: Optional[float] = None
+    
+    async def write_graph() -> None:
+        nonlocal graph_written
+        await graph_manager.create_book_graph(book)
+        graph_written = True
+        await _stage_progress()
+    
+    async def embed_chapter(index: int, chapter: Chapter, slots: asyncio.Semaphore) -> None:
+        async with slots:
+            embedded[index] = await embedding_gen.process_chapters(book, [chapter])
+            if not settings.PINECONE_INT8:
+                await queue.put(chapter)
+    
+    async def embed_chapters() -> None:
+        nonlocal embedding_scale
+        # Chapters are embedded concurrently and queued as each one finishes
+        slots = asyncio.Semaphore(settings.EMBEDDING_CONCURRENCY)
+        chapter_tasks = [
+            asyncio.create_task(embed_chapter(index, chapter, slots))
+            for index, chapter in enumerate(book.chapters)
+        ]
+        try:
+            await asyncio.gather(*chapter_tasks)
+        finally:
+            # On failure or cancellation, don't leave sibling chapters running
+            for task in chapter_tasks:
+                task.cancel()
+        
+        if settings.PINECONE_INT8:
+            # Quantized vectors share one scale across the book, so nothing
+            # is stored until every chapter has been embedded
+            if embedded:
+                embedding_scale = int8_scale(np.concatenate([matrix for _, matrix in embedded]))
+            for chapter in book.chapters:
+                await queue.put(chapter)
+        await queue.put(None)
+    
+    async def store_vectors() -> int:
+        nonlocal chapters_stored
+        stored = 0
+        while True:
+            chapter: Optional[Chapter] = await queue.get()
+            if chapter is None:
+                return stored
+            stored += await vector_store.store_book_vectors(
+                book,
+                [chapter],
+                embedding_scale=embedding_scale
+            )
+            chapters_stored += 1
+            await _stage_progress()
+    
+    tasks = [
+        asyncio.create_task(write_graph()),
+        asyncio.create_task(embed_chapters()),
+        asyncio.create_task(store_vectors())
+    ]
+    
+    try:
+        _, _, stored = await asyncio.gather(*tasks)
+    except Exception:
+        # Stop the remaining stages; the first failure is what gets reported
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    
+    if embedded:
+        book.concept_ids = np.concatenate([concept_ids for concept_ids, _ in embedded])
+        book.embeddings = np.concatenate([matrix for _, matrix in embedded])
+    
+    logger.info(
+        "Book ingested",
+        book_id=book.book_id,
+        title=book.title,
+        vectors_stored=stored
+    )
+    
+    return book
\ No newline at end of file
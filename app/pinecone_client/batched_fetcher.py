@@ -0,0 +1,77 @@
+"""Coalesce concurrent Pinecone fetches into batched calls."""
+
+from typing import Any, List, Optional, Set, Tuple
+import asyncio
+import structlog
+
+logger = structlog.get_logger()
+
+
+class BatchedFetcher:
+    """Batch single-id fetches that arrive within a short window.
+
+    Each ``fetch`` enqueues its id; a background worker drains up to
+    ``max_batch`` ids or waits at most ``max_wait`` seconds, issues one
+    ``index.fetch`` for the batch and resolves every caller's future.
+    """
+
+    def __init__(self, index, max_batch: int = 100, max_wait: float = 0.01):
+        self.index = index
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def fetch(self, vector_id: str) -> Optional[Any]:
+        """Fetch one vector, or None if it does not exist."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((vector_id, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the background worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    async def _run(self) -> None:
+        """Collect batches and dispatch them without waiting for the results."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Keep a reference so the dispatch task isn't garbage collected
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Fetch a batch of ids and resolve the waiting futures."""
+        ids = list({vector_id for vector_id, _ in batch})
+        try:
+            result = await self.index.fetch(ids=ids)
+        except Exception as e:
+            logger.error("Batched fetch failed", batch_size=len(ids), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for vector_id, future in batch:
+            if not future.done():
+                future.set_result(result.vectors.get(vector_id))
\ No newline at end of file
@@ -1,12 +1,16 @@
 """Pinecone vector storage operations."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from itertools import islice
 import asyncio
+import numpy as np
 from datetime import datetime
 import structlog
 
-from app.models.content import Book, Concept, SearchResult
+from app.models.content import Book, Chapter, SearchResult
 from app.core.config import settings
+from app.embeddings.quantization import quantize_embedding
+from app.pinecone_client.batched_fetcher import BatchedFetcher
 
 logger = structlog.get_logger()
 
@@ -18,47 +22,70 @@ class VectorStore:
         self.index = index
         self.dimension = settings.PINECONE_DIMENSION
         self.batch_size = 100
+        self.max_concurrent_upserts = 10
+        self.fetcher = BatchedFetcher(index)
     
-    async def store_book_vectors(self, book: Book) -> int:
-        """Store all concept vectors from a book."""
-        vectors = []
-        stored_count = 0
+    async def store_book_vectors(
+        self,
+        book: Book,
+        chapters: Optional[List[Chapter]] = None,
+        embedding_scale: Optional[float] = None
+    ) -> int:
+        """Store concept vectors from a book, optionally limited to ``chapters``.
         
-        # Collect all concepts with embeddings
-        for chapter in book.chapters:
-            for section in chapter.sections:
-                for concept in section.concepts:
-                    if concept.embedding:
-                        vector_data = self._create_vector_data(
-                            concept, book, chapter, section
-                        )
-                        vectors.append(vector_data)
+        With ``PINECONE_INT8``, values are quantized against ``embedding_scale``;
+        callers storing a book chapter by chapter should pass the scale of the
+        whole book so every vector shares it. Without one, the scale is taken
+        from the vectors being stored.
+        """
+        # Upsert batches concurrently, bounded so we don't flood the index
+        semaphore = asyncio.Semaphore(self.max_concurrent_upserts)
         
-        # Upsert in batches
-        for i in range(0, len(vectors), self.batch_size):
-            batch = vectors[i:i + self.batch_size]
-            
-            try:
-                # Pinecone upsert is synchronous, so run in executor
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    self.index.upsert,
-                    batch
-                )
-                
-                stored_count += len(batch)
-                logger.info(
-                    "Stored vector batch",
-                    batch_size=len(batch),
-                    total_stored=stored_count
-                )
-                
-            except Exception as e:
-                logger.error(
-                    "Failed to store vector batch",
-                    batch_index=i,
-                    error=str(e)
+        async def _upsert(batch_index: int, batch: List[Dict[str, Any]]) -> int:
+            async with semaphore:
+                try:
+                    await self.index.upsert(vectors=batch)
+                    return len(batch)
+                except Exception as e:
+                    logger.error(
+                        "Failed to store vector batch",
+                        batch_index=batch_index,
+                        error=str(e)
+                    )
+                    return 0
+        
+        if chapters is None:
+            chapters = book.chapters
+        concept_ids, values = self._embedding_arrays(book, chapters)
+        
+        # One timestamp for every vector written by this call
+        book_meta = {"indexed_at": datetime.utcnow().isoformat()}
+        if settings.PINECONE_INT8 and len(concept_ids):
+            # Quantize the whole matrix at once against a single scale,
+            # stored for dequantization. Pinecone only accepts float values,
+            # so the int8 levels go over the wire as floats
+            values, scale = quantize_embedding(values, embedding_scale)
+            values = values.astype(np.float32)
+            book_meta["embedding_scale"] = scale
+        
+        # Metadata is cut straight from the generator; values are row slices
+        # of the matrix, only converted to lists for the wire
+        metadata = self._iter_metadata(book, chapters, book_meta)
+        upserts = []
+        for start in range(0, len(concept_ids), self.batch_size):
+            end = start + self.batch_size
+            batch = [
+                {"id": concept_id, "values": row, "metadata": meta}
+                for concept_id, row, meta in zip(
+                    concept_ids[start:end].tolist(),
+                    values[start:end].tolist(),
+                    islice(metadata, self.batch_size)
                 )
+            ]
+            upserts.append(_upsert(len(upserts), batch))
+        
+        stored_counts = await asyncio.gather(*upserts)
+        stored_count = sum(stored_counts)
         
         logger.info(
             "Book vectors stored",
@@ -69,32 +96,71 @@ class VectorStore:
         
         return stored_count
     
-    def _create_vector_data(
-        self, 
-        concept: Concept, 
-        book: Book, 
-        chapter: "Chapter", 
-        section: "Section"
-    ) -> Dict[str, Any]:
-        """Create vector data for Pinecone."""
-        return {
-            "id": concept.concept_id,
-            "values": concept.embedding,
-            "metadata": {
-                "concept_name": concept.name[:100],
-                "concept_type": concept.type.value,
-                "content": concept.content[:500],  # First 500 chars
-                "book_id": book.book_id,
-                "book_title": book.title,
-                "subject": book.subject,
+    def _embedding_arrays(self, book: Book, chapters: List[Chapter]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return parallel concept id and embedding arrays for ``chapters``.
+        
+        Rows follow the order of ``_iter_metadata``. The book's own arrays are
+        used when the whole book is stored.
+        """
+        if chapters is book.chapters and book.embeddings is not None and book.concept_ids is not None:
+            return book.concept_ids, book.embeddings
+        
+        concepts = [
+            concept
+            for chapter in chapters
+            for section in chapter.sections
+            for concept in section.concepts
+            if concept.embedding is not None
+        ]
+        if not concepts:
+            return np.empty(0, dtype=object), np.empty((0, self.dimension), dtype=np.float32)
+        
+        return (
+            np.array([concept.concept_id for concept in concepts], dtype=object),
+            np.stack([concept.embedding for concept in concepts])
+        )
+    
+    def _iter_metadata(
+        self,
+        book: Book,
+        chapters: List[Chapter],
+        book_meta: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield Pinecone metadata for every concept in ``chapters`` with an embedding.
+        
+        Book, chapter and section metadata are built once per level and
+        shared by the concepts below it.
+        """
+        book_meta = {
+            **book_meta,
+            "book_id": book.book_id,
+            "book_title": book.title,
+            "subject": book.subject
+        }
+        
+        for chapter in chapters:
+            chapter_meta = {
+                **book_meta,
                 "chapter_id": chapter.chapter_id,
                 "chapter_number": chapter.number,
-                "chapter_title": chapter.title,
-                "section_id": section.section_id,
-                "section_title": section.title,
-                "indexed_at": datetime.utcnow().isoformat()
+                "chapter_title": chapter.title
             }
-        }
+            for section in chapter.sections:
+                section_meta = {
+                    **chapter_meta,
+                    "section_id": section.section_id,
+                    "section_title": section.title
+                }
+                for concept in section.concepts:
+                    if concept.embedding is None:
+                        continue
+                    
+                    yield {
+                        **section_meta,
+                        "concept_name": concept.name[:100],
+                        "concept_type": concept.type.value,
+                        "content": concept.content[:500]  # First 500 chars
+                    }
     
     async def search_similar(
         self,
@@ -114,15 +180,12 @@ class VectorStore:
                 if "concept_type" in filters:
                     pinecone_filter["concept_type"] = filters["concept_type"]
             
-            # Perform search (synchronous, so use executor)
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.index.query(
-                    vector=query_embedding,
-                    top_k=limit,
-                    include_metadata=True,
-                    filter=pinecone_filter if pinecone_filter else None
-                )
+            # Perform search
+            results = await self.index.query(
+                vector=query_embedding,
+                top_k=limit,
+                include_metadata=True,
+                filter=pinecone_filter if pinecone_filter else None
             )
             
             # Convert to SearchResult objects
@@ -151,14 +214,8 @@ class VectorStore:
     async def get_concept_by_id(self, concept_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a specific concept by ID."""
         try:
-            result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.index.fetch([concept_id])
-            )
-            
-            if concept_id in result.vectors:
-                return result.vectors[concept_id]
-            return None
+            # Concurrent lookups are coalesced into one fetch call
+            return await self.fetcher.fetch(concept_id)
             
         except Exception as e:
             logger.error("Failed to fetch concept", concept_id=concept_id, error=str(e))
@@ -168,11 +225,8 @@ class VectorStore:
         """Delete all vectors for a book."""
         try:
             # Delete by metadata filter
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.index.delete(
-                    filter={"book_id": book_id}
-                )
+            await self.index.delete(
+                filter={"book_id": book_id}
             )
             
             logger.info("Book vectors deleted", book_id=book_id)
@@ -200,10 +254,8 @@ class VectorStore:
             updated_metadata["updated_at"] = datetime.utcnow().isoformat()
             
             # Upsert with updated metadata
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.index.upsert,
-                [{
+            await self.index.upsert(
+                vectors=[{
                     "id": concept_id,
                     "values": current.values,
                     "metadata": updated_metadata
@@ -1,18 +1,52 @@
 """Content management routes."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+import hashlib
+import numpy as np
 from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from cachetools import TTLCache
+from neo4j import Query, RoutingControl
+import orjson
 import structlog
 
-from app.models.content import Book, Concept, SearchQuery, SearchResult
+from app.models.content import Book, Chapter, Section, Concept, SearchQuery, SearchResult
 from app.core.dependencies import get_pinecone_client, get_neo4j_client
-from app.embeddings.generator import EmbeddingGenerator
-from app.pinecone_client.vector_store import VectorStore
+from app.core.read_cache import cached, new_cache
+from app.embeddings.quantization import dequantize_embedding
+from app.core.config import settings
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Query embeddings keyed by query hash; embeddings don't go stale on ingest
+_query_embedding_cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+# Search results keyed by (query hash, limit, filters); cleared on ingest
+_search_cache = new_cache(maxsize=2_000, ttl=300)
+
+# Read queries, defined once so the text (and its cached plan) never varies
+LIST_BOOKS_QUERY = Query("""
+    MATCH (b:Book)
+    RETURN b.id AS id,
+           b.title AS title,
+           b.subject AS subject,
+           b.grade_level AS grade_level,
+           b.processed_at AS processed_at
+    ORDER BY b.processed_at DESC
+    """, timeout=settings.NEO4J_QUERY_TIMEOUT)
+
+GET_BOOK_QUERY = Query("""
+    MATCH (b:Book {id: $book_id})
+    OPTIONAL MATCH (b)-[:HAS_CHAPTER]->(c:Chapter)
+    OPTIONAL MATCH (c)-[:HAS_SECTION]->(s:Section)
+    OPTIONAL MATCH (s)-[:HAS_CONCEPT]->(co:Concept)
+    WITH b, c, s, collect(co) AS concepts
+    ORDER BY s.number
+    WITH b, c, collect({section: s, concepts: concepts}) AS sections
+    ORDER BY c.number
+    RETURN b, collect({chapter: c, sections: sections}) AS chapters
+    """, timeout=settings.NEO4J_QUERY_TIMEOUT)
+
 
 @router.get("/books", response_model=List[Book])
 async def list_books(request: Request):
@@ -20,23 +54,35 @@ async def list_books(request: Request):
     neo4j = request.app.state.neo4j
     
     try:
-        async with neo4j.session() as session:
-            result = await session.run("""
-                MATCH (b:Book)
-                RETURN b
-                ORDER BY b.processed_at DESC
-            """)
-            
-            books = []
-            async for record in result:
-                book_data = dict(record["b"])
-                books.append(Book(**book_data))
-            
-            return books
-            
+        records, _, _ = await neo4j.execute_query(
+            LIST_BOOKS_QUERY,
+            routing_=RoutingControl.READ,
+            database_=settings.NEO4J_DATABASE
+        )
     except Exception as e:
         logger.error("Failed to list books", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to retrieve books")
+    
+    # Encode the rows directly instead of building Book models for the whole catalog
+    return Response(
+        content=orjson.dumps([_book_summary(record) for record in records], option=orjson.OPT_UTC_Z),
+        media_type="application/json"
+    )
+
+
+def _book_summary(record) -> Dict[str, Any]:
+    """Build a list_books item with the same fields as a Book response."""
+    processed_at = record["processed_at"]
+    return {
+        "book_id": record["id"],
+        "title": record["title"],
+        "subject": record["subject"],
+        "grade_level": record["grade_level"],
+        "chapters": [],
+        "s3_key": None,
+        "processed_at": processed_at.to_native() if processed_at is not None else None,
+        "metadata": {}
+    }
 
 
 @router.get("/books/{book_id}", response_model=Book)
@@ -45,34 +91,21 @@ async def get_book(book_id: str, request: Request):
     neo4j = request.app.state.neo4j
     
     try:
-        async with neo4j.session() as session:
-            # Get book with full structure
-            result = await session.run("""
-                MATCH (b:Book {id: $book_id})
-                OPTIONAL MATCH (b)-[:HAS_CHAPTER]->(c:Chapter)
-                OPTIONAL MATCH (c)-[:HAS_SECTION]->(s:Section)
-                OPTIONAL MATCH (s)-[:HAS_CONCEPT]->(co:Concept)
-                RETURN b, c, s, co
-                ORDER BY c.number, s.number
-            """, book_id=book_id)
-            
-            # Process results to build book structure
-            book = None
-            chapters_dict = {}
-            sections_dict = {}
-            
-            async for record in result:
-                if not book and record["b"]:
-                    book = Book(**dict(record["b"]))
-                
-                # Build structure
-                # Implementation details omitted for brevity
-            
-            if not book:
-                raise HTTPException(status_code=404, detail="Book not found")
-            
-            return book
-            
+        # Get book with full structure, aggregated into a single record
+        records, _, _ = await neo4j.execute_query(
+            GET_BOOK_QUERY,
+            book_id=book_id,
+            routing_=RoutingControl.READ,
+            database_=settings.NEO4J_DATABASE
+        )
+        
+        book = _book_from_record(records[0]) if records else None
+        
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+        
+        return book
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -80,26 +113,82 @@ async def get_book(book_id: str, request: Request):
         raise HTTPException(status_code=500, detail="Failed to retrieve book")
 
 
+def _book_from_record(record) -> Book:
+    """Build a Book from the nested chapter/section/concept collections.
+    
+    Chapters and sections arrive already ordered by number from the query.
+    """
+    b = record["b"]
+    processed_at = b.get("processed_at")
+    
+    chapters = []
+    for chapter_row in record["chapters"]:
+        c = chapter_row["chapter"]
+        if c is None:
+            continue
+        
+        sections = []
+        for section_row in chapter_row["sections"]:
+            s = section_row["section"]
+            if s is None:
+                continue
+            
+            sections.append(Section(
+                section_id=s["id"],
+                title=s["title"],
+                number=s.get("number"),
+                concepts=[
+                    Concept(
+                        concept_id=co["id"],
+                        name=co["name"],
+                        content=co.get("content", ""),
+                        type=co["type"]
+                    )
+                    for co in section_row["concepts"]
+                ]
+            ))
+        
+        chapters.append(Chapter(
+            chapter_id=c["id"],
+            number=c["number"],
+            title=c["title"],
+            sections=sections
+        ))
+    
+    return Book(
+        book_id=b["id"],
+        title=b["title"],
+        subject=b["subject"],
+        grade_level=b.get("grade_level"),
+        processed_at=processed_at.to_native() if processed_at is not None else None,
+        chapters=chapters
+    )
+
+
 @router.get("/concepts/{concept_id}", response_model=Concept)
+@cached("concept")
 async def get_concept(concept_id: str, request: Request):
     """Get concept details."""
-    pinecone = request.app.state.pinecone
+    vector_store = request.app.state.vector_store
     
     try:
-        vector_store = VectorStore(pinecone)
         concept_data = await vector_store.get_concept_by_id(concept_id)
         
         if not concept_data:
             raise HTTPException(status_code=404, detail="Concept not found")
         
         # Reconstruct concept from vector data
-        metadata = concept_data.get("metadata", {})
+        metadata = concept_data.get("metadata") or {}
+        embedding = concept_data.get("values")
+        if embedding and "embedding_scale" in metadata:
+            # Stored as int8 levels; restore the float embedding
+            embedding = dequantize_embedding(np.asarray(embedding), metadata["embedding_scale"])
         concept = Concept(
             concept_id=concept_id,
             name=metadata.get("concept_name", ""),
             content=metadata.get("content", ""),
             type=metadata.get("concept_type", "explanation"),
-            embedding=concept_data.get("values"),
+            embedding=embedding,
             metadata=metadata
         )
         
@@ -115,21 +204,35 @@ async def get_concept(concept_id: str, request: Request):
 @router.post("/search", response_model=List[SearchResult])
 async def search_concepts(query: SearchQuery, request: Request):
     """Search for concepts using semantic similarity."""
-    pinecone = request.app.state.pinecone
+    embedding_gen = request.app.state.embedding_gen
+    vector_store = request.app.state.vector_store
     
     try:
+        query_hash = hashlib.sha256(query.query.encode()).hexdigest()
+        search_key = (
+            query_hash,
+            query.limit,
+            orjson.dumps(query.filters, option=orjson.OPT_SORT_KEYS)
+        )
+        
+        results = _search_cache.get(search_key)
+        if results is not None:
+            return results
+        
         # Generate embedding for query
-        embedding_gen = EmbeddingGenerator()
-        query_embedding = await embedding_gen.generate_embedding(query.query)
+        query_embedding = _query_embedding_cache.get(query_hash)
+        if query_embedding is None:
+            query_embedding = await embedding_gen.generate_embedding(query.query)
+            _query_embedding_cache[query_hash] = query_embedding
         
         # Search in Pinecone
-        vector_store = VectorStore(pinecone)
         results = await vector_store.search_similar(
             query_embedding=query_embedding,
             limit=query.limit,
             filters=query.filters
         )
         
+        _search_cache[search_key] = results
         return results
         
     except Exception as e:
@@ -2,22 +2,86 @@
 
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Request, Query
+from neo4j import Query as CypherQuery, RoutingControl
 import structlog
 
 from app.models.content import ConceptGraph, LearningPath
-from app.neo4j_client.graph_manager import GraphManager
+from app.core.read_cache import cached, new_cache
+from app.core.config import settings
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Graph statistics only change on ingest, which clears this cache
+_stats_cache = new_cache(maxsize=1, ttl=60)
+
+# Deepest prerequisite chain followed when listing prerequisites
+MAX_PREREQUISITE_DEPTH = 10
+
+# Read queries, defined once so the text (and its cached plan) never varies
+_PREREQUISITES_APOC_QUERY = CypherQuery("""
+    MATCH (c:Concept {id: $concept_id})
+    CALL apoc.path.subgraphNodes(c, {
+        relationshipFilter: '<PREREQUISITE',
+        labelFilter: '+Concept',
+        minLevel: 1,
+        maxLevel: $max_depth
+    }) YIELD node AS p
+    RETURN p.id AS id, p.name AS name, p.type AS type
+    ORDER BY name
+    """, timeout=settings.NEO4J_QUERY_TIMEOUT)
+
+_PREREQUISITES_QUERY = CypherQuery(f"""
+    MATCH (c:Concept {{id: $concept_id}})
+    USING INDEX c:Concept(id)
+    MATCH (c)<-[:PREREQUISITE*1..{MAX_PREREQUISITE_DEPTH}]-(p:Concept)
+    RETURN DISTINCT p.id AS id, p.name AS name, p.type AS type
+    ORDER BY name
+    """, timeout=settings.NEO4J_QUERY_TIMEOUT)
+
+_RELATED_QUERY = CypherQuery("""
+    MATCH (c:Concept {id: $concept_id})
+    MATCH (c)-[r:RELATED_TO|PREREQUISITE|HAS_CONCEPT]-(related:Concept)
+    WHERE related.id <> $concept_id
+    RETURN DISTINCT related.id AS id,
+           related.name AS name,
+           related.type AS type,
+           type(r) AS relationship
+    LIMIT $limit
+    """, timeout=settings.NEO4J_QUERY_TIMEOUT)
+
+# Prerequisites and related concepts in one round trip sharing the concept lookup
+_CONTEXT_QUERY = CypherQuery(f"""
+    MATCH (c:Concept {{id: $concept_id}})
+    OPTIONAL MATCH (c)<-[:PREREQUISITE*1..{MAX_PREREQUISITE_DEPTH}]-(p:Concept)
+    WITH c, p
+    ORDER BY p.name
+    WITH c, collect(DISTINCT p {{.id, .name, .type}}) AS prerequisites
+    OPTIONAL MATCH (c)-[r:RELATED_TO|PREREQUISITE|HAS_CONCEPT]-(related:Concept)
+    WHERE related.id <> c.id
+    RETURN prerequisites,
+           collect(DISTINCT related {{.id, .name, .type, relationship: type(r)}})[..$limit] AS related
+    """, timeout=settings.NEO4J_QUERY_TIMEOUT)
+
+# Each independent subquery is answered from the count store
+_STATISTICS_QUERY = CypherQuery("""
+    CALL { MATCH (b:Book) RETURN count(b) AS books }
+    CALL { MATCH (c:Chapter) RETURN count(c) AS chapters }
+    CALL { MATCH (s:Section) RETURN count(s) AS sections }
+    CALL { MATCH (co:Concept) RETURN count(co) AS concepts }
+    CALL { MATCH ()-[r:PREREQUISITE]->() RETURN count(r) AS prerequisites }
+    CALL { MATCH ()-[r:RELATED_TO]->() RETURN count(r) AS related }
+    RETURN books, chapters, sections, concepts, prerequisites, related
+    """, timeout=settings.NEO4J_QUERY_TIMEOUT)
+
 
 @router.get("/concept/{concept_id}", response_model=ConceptGraph)
 async def get_concept_graph(concept_id: str, request: Request):
     """Get concept with all its relationships."""
-    neo4j = request.app.state.neo4j
+    # GraphManager caches concept graphs itself
+    graph_manager = request.app.state.graph_manager
     
     try:
-        graph_manager = GraphManager(neo4j)
         concept_graph = await graph_manager.get_concept_graph(concept_id)
         
         if not concept_graph:
@@ -33,39 +97,52 @@ async def get_concept_graph(concept_id: str, request: Request):
 
 
 @router.get("/prerequisites/{concept_id}")
+@cached("prerequisites")
 async def get_prerequisites(concept_id: str, request: Request):
     """Get all prerequisites for a concept."""
     neo4j = request.app.state.neo4j
     
     try:
-        async with neo4j.session() as session:
-            result = await session.run("""
-                MATCH (c:Concept {id: $concept_id})<-[:PREREQUISITE*]-(p:Concept)
-                RETURN DISTINCT p
-                ORDER BY p.name
-            """, concept_id=concept_id)
-            
-            prerequisites = []
-            async for record in result:
-                prereq = dict(record["p"])
-                prerequisites.append({
-                    "concept_id": prereq["id"],
-                    "name": prereq["name"],
-                    "type": prereq.get("type", "explanation")
-                })
-            
-            return {
-                "concept_id": concept_id,
-                "prerequisites": prerequisites,
-                "total": len(prerequisites)
+        if request.app.state.graph_manager.has_apoc:
+            # APOC visits each prerequisite once instead of once per path
+            records, _, _ = await neo4j.execute_query(
+                _PREREQUISITES_APOC_QUERY,
+                concept_id=concept_id,
+                max_depth=MAX_PREREQUISITE_DEPTH,
+                routing_=RoutingControl.READ,
+                database_=settings.NEO4J_DATABASE
+            )
+        else:
+            # APOC not installed; use a bounded variable-length match
+            records, _, _ = await neo4j.execute_query(
+                _PREREQUISITES_QUERY,
+                concept_id=concept_id,
+                routing_=RoutingControl.READ,
+                database_=settings.NEO4J_DATABASE
+            )
+        
+        prerequisites = [
+            {
+                "concept_id": record["id"],
+                "name": record["name"],
+                "type": record["type"] or "explanation"
             }
-            
+            for record in records
+        ]
+        
+        return {
+            "concept_id": concept_id,
+            "prerequisites": prerequisites,
+            "total": len(prerequisites)
+        }
+        
     except Exception as e:
         logger.error("Failed to get prerequisites", concept_id=concept_id, error=str(e))
         raise HTTPException(status_code=500, detail="Failed to retrieve prerequisites")
 
 
 @router.get("/related/{concept_id}")
+@cached("related")
 async def get_related_concepts(
     concept_id: str,
     request: Request,
@@ -75,37 +152,92 @@ async def get_related_concepts(
     neo4j = request.app.state.neo4j
     
     try:
-        async with neo4j.session() as session:
-            # Get related concepts through various relationships
-            result = await session.run("""
-                MATCH (c:Concept {id: $concept_id})
-                MATCH (c)-[r:RELATED_TO|PREREQUISITE|HAS_CONCEPT]-(related:Concept)
-                WHERE related.id <> $concept_id
-                RETURN DISTINCT related, type(r) as relationship
-                LIMIT $limit
-            """, concept_id=concept_id, limit=limit)
-            
-            related = []
-            async for record in result:
-                concept_data = dict(record["related"])
-                related.append({
-                    "concept_id": concept_data["id"],
-                    "name": concept_data["name"],
-                    "type": concept_data.get("type", "explanation"),
-                    "relationship": record["relationship"]
-                })
-            
-            return {
-                "concept_id": concept_id,
-                "related_concepts": related,
-                "total": len(related)
+        # Get related concepts through various relationships
+        records, _, _ = await neo4j.execute_query(
+            _RELATED_QUERY,
+            concept_id=concept_id,
+            limit=limit,
+            routing_=RoutingControl.READ,
+            database_=settings.NEO4J_DATABASE
+        )
+        
+        related = [
+            {
+                "concept_id": record["id"],
+                "name": record["name"],
+                "type": record["type"] or "explanation",
+                "relationship": record["relationship"]
             }
-            
+            for record in records
+        ]
+        
+        return {
+            "concept_id": concept_id,
+            "related_concepts": related,
+            "total": len(related)
+        }
+        
     except Exception as e:
         logger.error("Failed to get related concepts", concept_id=concept_id, error=str(e))
         raise HTTPException(status_code=500, detail="Failed to retrieve related concepts")
 
 
+@router.get("/concept/{concept_id}/context")
+@cached("context")
+async def get_concept_context(
+    concept_id: str,
+    request: Request,
+    limit: int = Query(default=10, ge=1, le=50)
+):
+    """Get prerequisites and related concepts together."""
+    neo4j = request.app.state.neo4j
+    
+    try:
+        records, _, _ = await neo4j.execute_query(
+            _CONTEXT_QUERY,
+            concept_id=concept_id,
+            limit=limit,
+            routing_=RoutingControl.READ,
+            database_=settings.NEO4J_DATABASE
+        )
+        
+        if not records:
+            raise HTTPException(status_code=404, detail="Concept not found")
+        
+        record = records[0]
+        prerequisites = [
+            {
+                "concept_id": node["id"],
+                "name": node["name"],
+                "type": node["type"] or "explanation"
+            }
+            for node in record["prerequisites"]
+        ]
+        related = [
+            {
+                "concept_id": node["id"],
+                "name": node["name"],
+                "type": node["type"] or "explanation",
+                "relationship": node["relationship"]
+            }
+            for node in record["related"]
+        ]
+        
+        return {
+            "concept_id": concept_id,
+            "prerequisites": prerequisites,
+            "related_concepts": related,
+            "total_prerequisites": len(prerequisites),
+            "total_related": len(related)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get concept context", concept_id=concept_id, error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to retrieve concept context")
+
+
 @router.get("/path", response_model=Optional[LearningPath])
 async def find_learning_path(
     request: Request,
@@ -113,10 +245,9 @@ async def find_learning_path(
     to_concept: str = Query(..., description="Target concept ID")
 ):
     """Find learning path between two concepts."""
-    neo4j = request.app.state.neo4j
+    graph_manager = request.app.state.graph_manager
     
     try:
-        graph_manager = GraphManager(neo4j)
         path = await graph_manager.find_learning_path(from_concept, to_concept)
         
         if not path:
@@ -146,32 +277,32 @@ async def get_graph_statistics(request: Request):
     """Get knowledge graph statistics."""
     neo4j = request.app.state.neo4j
     
+    cached_stats = _stats_cache.get("stats")
+    if cached_stats is not None:
+        return cached_stats
+    
     try:
-        async with neo4j.session() as session:
-            # Get counts
-            result = await session.run("""
-                MATCH (b:Book) WITH count(b) as books
-                MATCH (c:Chapter) WITH books, count(c) as chapters
-                MATCH (s:Section) WITH books, chapters, count(s) as sections
-                MATCH (co:Concept) WITH books, chapters, sections, count(co) as concepts
-                MATCH ()-[r:PREREQUISITE]->() WITH books, chapters, sections, concepts, count(r) as prerequisites
-                MATCH ()-[r:RELATED_TO]->() WITH books, chapters, sections, concepts, prerequisites, count(r) as related
-                RETURN books, chapters, sections, concepts, prerequisites, related
-            """)
-            
-            stats = await result.single()
-            
-            return {
-                "books": stats["books"] or 0,
-                "chapters": stats["chapters"] or 0,
-                "sections": stats["sections"] or 0,
-                "concepts": stats["concepts"] or 0,
-                "relationships": {
-                    "prerequisites": stats["prerequisites"] or 0,
-                    "related": stats["related"] or 0
-                }
+        # Get counts
+        records, _, _ = await neo4j.execute_query(
+            _STATISTICS_QUERY,
+            routing_=RoutingControl.READ,
+            database_=settings.NEO4J_DATABASE
+        )
+        
+        stats = records[0]
+        
+        _stats_cache["stats"] = {
+            "books": stats["books"] or 0,
+            "chapters": stats["chapters"] or 0,
+            "sections": stats["sections"] or 0,
+            "concepts": stats["concepts"] or 0,
+            "relationships": {
+                "prerequisites": stats["prerequisites"] or 0,
+                "related": stats["related"] or 0
             }
-            
+        }
+        return _stats_cache["stats"]
+        
     except Exception as e:
         logger.error("Failed to get graph statistics", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to retrieve statistics")
@@ -1,16 +1,49 @@
 """Hook generation routes."""
 
 from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException, Request
+import asyncio
+import hashlib
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import Response, StreamingResponse
+import orjson
 from pydantic import BaseModel, Field
 import structlog
 
-from app.content_generation.hook_generator import HookGenerator
 from app.models.content import Concept
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Hook templates are static, so they are encoded once at import
+HOOK_TEMPLATES = {
+    "categories": {
+        "personal": {
+            "description": "Connects to personal interests and hobbies",
+            "example": "Since you love basketball, understanding physics helps you..."
+        },
+        "career": {
+            "description": "Links to future career aspirations",
+            "example": "As a future game developer, this math concept..."
+        },
+        "social": {
+            "description": "Relates to social activities and collaboration",
+            "example": "When working with your robotics team, this concept..."
+        },
+        "philanthropic": {
+            "description": "Connects to causes and making a difference",
+            "example": "To help with environmental conservation, understanding..."
+        }
+    },
+    "supported_interests": [
+        "sports", "music", "art", "technology", "gaming",
+        "science", "nature", "animals", "cooking", "travel",
+        "reading", "writing", "photography", "dance", "theater"
+    ]
+}
+
+_TEMPLATES_BYTES = orjson.dumps(HOOK_TEMPLATES)
+_TEMPLATES_ETAG = f'"{hashlib.md5(_TEMPLATES_BYTES).hexdigest()}"'
+
 
 class HookGenerationRequest(BaseModel):
     """Request model for hook generation."""
@@ -21,6 +54,15 @@ class HookGenerationRequest(BaseModel):
     )
 
 
+class BatchHookGenerationRequest(BaseModel):
+    """Request model for hook generation across many concepts."""
+    concept_ids: List[str] = Field(..., min_items=1, max_items=200)
+    student_interests: List[str] = Field(..., min_items=1)
+    categories: List[str] = Field(
+        default=["personal", "career", "social", "philanthropic"]
+    )
+
+
 class ExampleGenerationRequest(BaseModel):
     """Request model for example generation."""
     concept_id: str
@@ -31,15 +73,15 @@ class ExampleGenerationRequest(BaseModel):
 @router.post("/generate")
 async def generate_hooks(
     request_data: HookGenerationRequest,
-    request: Request
+    request: Request,
+    refresh: bool = Query(default=False, description="Bypass cached hooks")
 ):
     """Generate personalized hooks for a concept."""
-    pinecone = request.app.state.pinecone
+    vector_store = request.app.state.vector_store
+    hook_gen = request.app.state.hook_gen
     
     try:
         # Get concept from Pinecone
-        from app.pinecone_client.vector_store import VectorStore
-        vector_store = VectorStore(pinecone)
         concept_data = await vector_store.get_concept_by_id(request_data.concept_id)
         
         if not concept_data:
@@ -55,11 +97,11 @@ async def generate_hooks(
         )
         
         # Generate hooks
-        hook_gen = HookGenerator()
         hooks = await hook_gen.generate_hooks(
             concept=concept,
             student_interests=request_data.student_interests,
-            categories=request_data.categories
+            categories=request_data.categories,
+            use_cache=not refresh
         )
         
         return hooks
@@ -75,18 +117,124 @@ async def generate_hooks(
         raise HTTPException(status_code=500, detail="Hook generation failed")
 
 
+@router.post("/generate/stream")
+async def stream_hooks(
+    request_data: HookGenerationRequest,
+    request: Request
+):
+    """Stream personalized hooks for a concept as NDJSON, one category per line."""
+    vector_store = request.app.state.vector_store
+    hook_gen = request.app.state.hook_gen
+    
+    try:
+        # Get concept from Pinecone
+        concept_data = await vector_store.get_concept_by_id(request_data.concept_id)
+        
+        if not concept_data:
+            raise HTTPException(status_code=404, detail="Concept not found")
+        
+        # Reconstruct concept
+        metadata = concept_data.get("metadata", {})
+        concept = Concept(
+            concept_id=request_data.concept_id,
+            name=metadata.get("concept_name", ""),
+            content=metadata.get("content", ""),
+            type=metadata.get("concept_type", "explanation")
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            "Hook generation failed",
+            concept_id=request_data.concept_id,
+            error=str(e)
+        )
+        raise HTTPException(status_code=500, detail="Hook generation failed")
+    
+    async def ndjson():
+        async for category, hook in hook_gen.stream_hooks(
+            concept=concept,
+            student_interests=request_data.student_interests,
+            categories=request_data.categories
+        ):
+            yield orjson.dumps({"category": category, "hook": hook}) + b"\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.post("/generate/batch")
+async def generate_hooks_batch(
+    request_data: BatchHookGenerationRequest,
+    request: Request
+):
+    """Generate personalized hooks for many concepts at once."""
+    vector_store = request.app.state.vector_store
+    hook_gen = request.app.state.hook_gen
+    
+    try:
+        # Get concepts from Pinecone
+        concepts_data = await asyncio.gather(*[
+            vector_store.get_concept_by_id(concept_id)
+            for concept_id in request_data.concept_ids
+        ])
+        
+        # Reconstruct concepts, skipping unknown IDs
+        concepts = []
+        missing = []
+        for concept_id, concept_data in zip(request_data.concept_ids, concepts_data):
+            if not concept_data:
+                missing.append(concept_id)
+                continue
+            metadata = concept_data.get("metadata", {})
+            concepts.append(Concept(
+                concept_id=concept_id,
+                name=metadata.get("concept_name", ""),
+                content=metadata.get("content", ""),
+                type=metadata.get("concept_type", "explanation")
+            ))
+        
+        # Generate hooks
+        results = await hook_gen.generate_hooks_many(
+            concepts=concepts,
+            student_interests=request_data.student_interests,
+            categories=request_data.categories
+        )
+        
+        hooks = []
+        failed = list(missing)
+        for concept, result in zip(concepts, results):
+            if isinstance(result, BaseException):
+                failed.append(concept.concept_id)
+            else:
+                hooks.append(result)
+        
+        return {
+            "hooks": hooks,
+            "failed": failed,
+            "total": len(hooks)
+        }
+        
+    except Exception as e:
+        logger.error(
+            "Batch hook generation failed",
+            concept_count=len(request_data.concept_ids),
+            error=str(e)
+        )
+        raise HTTPException(status_code=500, detail="Hook generation failed")
+
+
 @router.post("/examples")
 async def generate_examples(
     request_data: ExampleGenerationRequest,
     request: Request
 ):
     """Generate personalized examples for a concept."""
-    pinecone = request.app.state.pinecone
+    vector_store = request.app.state.vector_store
+    hook_gen = request.app.state.hook_gen
     
     try:
         # Get concept from Pinecone
-        from app.pinecone_client.vector_store import VectorStore
-        vector_store = VectorStore(pinecone)
         concept_data = await vector_store.get_concept_by_id(request_data.concept_id)
         
         if not concept_data:
@@ -102,7 +250,6 @@ async def generate_examples(
         )
         
         # Generate examples
-        hook_gen = HookGenerator()
         examples = await hook_gen.generate_examples(
             concept=concept,
             student_interests=request_data.student_interests,
@@ -127,30 +274,10 @@ async def generate_examples(
 
 
 @router.get("/templates")
-async def get_hook_templates():
+async def get_hook_templates(request: Request):
     """Get available hook generation templates."""
-    return {
-        "categories": {
-            "personal": {
-                "description": "Connects to personal interests and hobbies",
-                "example": "Since you love basketball, understanding physics helps you..."
-            },
-            "career": {
-                "description": "Links to future career aspirations",
-                "example": "As a future game developer, this math concept..."
-            },
-            "social": {
-                "description": "Relates to social activities and collaboration",
-                "example": "When working with your robotics team, this concept..."
-            },
-            "philanthropic": {
-                "description": "Connects to causes and making a difference",
-                "example": "To help with environmental conservation, understanding..."
-            }
-        },
-        "supported_interests": [
-            "sports", "music", "art", "technology", "gaming",
-            "science", "nature", "animals", "cooking", "travel",
-            "reading", "writing", "photography", "dance", "theater"
-        ]
-    }
\ No newline at end of file
+    headers = {"ETag": _TEMPLATES_ETAG, "Cache-Control": "public, max-age=86400"}
+    if request.headers.get("if-none-match") == _TEMPLATES_ETAG:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=_TEMPLATES_BYTES, media_type="application/json", headers=headers)
\ No newline at end of file
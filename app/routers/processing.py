@@ -8,18 +8,16 @@ import aiofiles
 import uuid
 
 from app.models.content import ProcessingJob, ProcessingStatus
-from app.pdf_processing.extractor import PDFExtractor
-from app.embeddings.generator import EmbeddingGenerator
-from app.neo4j_client.graph_manager import GraphManager
-from app.pinecone_client.vector_store import VectorStore
-from app.core.dependencies import get_s3_client
+from app.pdf_processing.pipeline import ingest
+from app.core.dependencies import get_job_store
+from app.core.read_cache import publish_invalidation
 from app.core.config import settings
 
 router = APIRouter()
 logger = structlog.get_logger()
 
-# In-memory job tracking (use Redis in production)
-processing_jobs = {}
+# Uploads are spooled to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
 
 
 @router.post("/upload")
@@ -33,13 +31,8 @@ async def upload_pdf(
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
     
-    # Check file size
-    contents = await file.read()
-    if len(contents) > settings.get_max_pdf_size_bytes():
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size is {settings.MAX_PDF_SIZE_MB}MB"
-        )
+    # Spool to disk, checking the size as it streams
+    pdf_path = await _spool_upload(file)
     
     # Create processing job
     job_id = str(uuid.uuid4())
@@ -52,23 +45,23 @@ async def upload_pdf(
         status=ProcessingStatus.PENDING
     )
     
-    processing_jobs[job_id] = job
+    job_store = await get_job_store()
+    await job_store.set(job)
     
     try:
-        # Upload to S3
-        s3_client = get_s3_client()
-        s3_client.put_object(
-            Bucket=settings.S3_BUCKET,
-            Key=s3_key,
-            Body=contents,
-            ContentType='application/pdf'
+        # Upload to S3 (multipart for large files)
+        await request.app.state.s3.upload_file(
+            pdf_path,
+            settings.S3_BUCKET,
+            s3_key,
+            ExtraArgs={"ContentType": "application/pdf"}
         )
         
         # Start background processing
         background_tasks.add_task(
             process_pdf_task,
             job_id,
-            contents,
+            pdf_path,
             job.book_title,
             request.app.state
         )
@@ -83,53 +76,80 @@ async def upload_pdf(
         logger.error("PDF upload failed", error=str(e))
         job.status = ProcessingStatus.FAILED
         job.error_message = str(e)
+        await job_store.set(job)
+        os.remove(pdf_path)
         raise HTTPException(status_code=500, detail="Upload failed")
 
 
+async def _spool_upload(file: UploadFile) -> str:
+    """Copy an upload to a temporary file and return its path.
+    
+    Rejects the upload as soon as it exceeds the size limit.
+    """
+    max_size = settings.get_max_pdf_size_bytes()
+    size = 0
+    
+    async with aiofiles.tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spool:
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File too large. Maximum size is {settings.MAX_PDF_SIZE_MB}MB"
+                    )
+                await spool.write(chunk)
+        except BaseException:
+            # Too large, client disconnect or read error; don't leave the spool behind
+            await spool.close()
+            os.remove(spool.name)
+            raise
+    
+    return spool.name
+
+
 async def process_pdf_task(
     job_id: str,
-    pdf_bytes: bytes,
+    pdf_path: str,
     title: str,
     app_state
 ):
     """Background task to process PDF."""
-    job = processing_jobs.get(job_id)
+    job_store = await get_job_store()
+    job = await job_store.get(job_id)
     if not job:
+        os.remove(pdf_path)
         return
     
     try:
         job.status = ProcessingStatus.PROCESSING
         job.started_at = datetime.utcnow()
+        await job_store.set(job)
         
-        # Extract content
-        logger.info("Starting PDF extraction", job_id=job_id)
-        extractor = PDFExtractor()
-        book = await extractor.extract_from_bytes(pdf_bytes, title)
-        
-        job.progress = 25
+        # Extract, embed and store the book as a pipeline
+        logger.info("Starting PDF ingest", job_id=job_id)
         
-        # Generate embeddings
-        logger.info("Generating embeddings", job_id=job_id)
-        embedding_gen = EmbeddingGenerator()
-        book = await embedding_gen.process_book(book)
+        async def _set_progress(percent: int) -> None:
+            job.progress = percent
+            await job_store.set_progress(job_id, percent)
         
-        job.progress = 50
-        
-        # Create knowledge graph
-        logger.info("Creating knowledge graph", job_id=job_id)
-        graph_manager = GraphManager(app_state.neo4j)
-        await graph_manager.create_book_graph(book)
-        
-        job.progress = 75
-        
-        # Store vectors
-        logger.info("Storing vectors", job_id=job_id)
-        vector_store = VectorStore(app_state.pinecone)
-        await vector_store.store_book_vectors(book)
+        await ingest(
+            pdf_path,
+            title,
+            app_state.pdf_extractor,
+            app_state.graph_manager,
+            app_state.vector_store,
+            app_state.embedding_gen,
+            on_progress=_set_progress
+        )
         
         job.progress = 100
         job.status = ProcessingStatus.COMPLETED
         job.completed_at = datetime.utcnow()
+        await job_store.set(job)
+        
+        # New concepts and edges make cached reads stale on every worker
+        await publish_invalidation()
         
         logger.info(
             "PDF processing completed",
@@ -142,12 +162,17 @@ async def process_pdf_task(
         job.status = ProcessingStatus.FAILED
         job.error_message = str(e)
         job.completed_at = datetime.utcnow()
+        await job_store.set(job)
+    
+    finally:
+        os.remove(pdf_path)
 
 
 @router.get("/status/{job_id}")
 async def get_job_status(job_id: str):
     """Get processing job status."""
-    job = processing_jobs.get(job_id)
+    job_store = await get_job_store()
+    job = await job_store.get(job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -0,0 +1,8 @@
+"""Shared test setup."""
+
+import os
+
+# Settings are read at import time; the tests never talk to these services
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("PINECONE_API_KEY", "test")
+os.environ.setdefault("NEO4J_PASSWORD", "test")
\ No newline at end of file
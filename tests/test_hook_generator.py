@@ -0,0 +1,124 @@
+"""Tests for streamed hook parsing."""
+
+import pytest
+
+from app.content_generation.hook_generator import HookGenerator, _StreamingObjectParser
+from app.models.content import Concept
+
+
+RESPONSE = (
+    '{"personal": "Say \\"hi\\" \\\\ then {go} [now]",'
+    ' "career": {"roles": ["engineer", "}"], "level": 2},'
+    ' "score": 3.5, "ready": true, "extra": null}'
+)
+
+EXPECTED = {
+    "personal": 'Say "hi" \\ then {go} [now]',
+    "career": {"roles": ["engineer", "}"], "level": 2},
+    "score": 3.5,
+    "ready": True,
+    "extra": None
+}
+
+
+def _feed(text, chunk_size):
+    parser = _StreamingObjectParser()
+    pairs = []
+    for start in range(0, len(text), chunk_size):
+        pairs.extend(parser.feed(text[start:start + chunk_size]))
+    return parser, pairs
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, len(RESPONSE)])
+def test_parser_handles_any_chunk_boundary(chunk_size):
+    parser, pairs = _feed(RESPONSE, chunk_size)
+    
+    assert dict(pairs) == EXPECTED
+    assert [key for key, _ in pairs] == list(EXPECTED)
+    parser.close()
+
+
+def test_parser_yields_members_as_they_complete():
+    parser = _StreamingObjectParser()
+    
+    assert parser.feed('{"personal": "abc", "care') == [("personal", "abc")]
+    assert parser.feed('er": "xyz"}') == [("career", "xyz")]
+    parser.close()
+
+
+@pytest.mark.parametrize("text", [
+    '{"personal": "abc", "care',
+    '{"personal": "abc", "career": {"roles": ["a"',
+    '{"personal": "ab\\"',
+    'Sorry, I cannot help',
+    ''
+])
+def test_parser_rejects_incomplete_input(text):
+    parser, _ = _feed(text, 4)
+    
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+class _Delta:
+    def __init__(self, content):
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content):
+        self.delta = _Delta(content)
+
+
+class _Chunk:
+    def __init__(self, content):
+        self.choices = [_Choice(content)]
+
+
+class _FakeCompletions:
+    def __init__(self, text):
+        self.text = text
+    
+    async def create(self, **kwargs):
+        async def stream():
+            for start in range(0, len(self.text), 4):
+                yield _Chunk(self.text[start:start + 4])
+        return stream()
+
+
+class _FakeClient:
+    def __init__(self, text):
+        self.chat = type("Chat", (), {"completions": _FakeCompletions(text)})()
+
+
+def _generator(text):
+    generator = HookGenerator.__new__(HookGenerator)
+    generator.client = _FakeClient(text)
+    generator.model = "test"
+    return generator
+
+
+async def _collect(generator, categories):
+    concept = Concept(name="Force", content="Push or pull", type="explanation")
+    return [
+        pair
+        async for pair in generator.stream_hooks(concept, ["sports"], categories)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_hooks_returns_every_requested_category():
+    pairs = await _collect(_generator('{"personal": "a", "career": "b"}'), ["personal", "career"])
+    
+    assert dict(pairs) == {"personal": "a", "career": "b"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text", [
+    '{"personal": "abc", "care',
+    '{"personal": "abc"}',
+    'Sorry, I cannot help'
+])
+async def test_stream_hooks_rejects_truncated_or_partial_responses(text):
+    with pytest.raises(ValueError):
+        await _collect(_generator(text), ["personal", "career"])
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""Tests for Pinecone vector storage."""
+
+import numpy as np
+import pytest
+
+from pinecone.data.vector_factory import VectorFactory
+
+from app.core.config import settings
+from app.embeddings.quantization import int8_scale
+from app.models.content import Book, Chapter, Concept, Section
+from app.pinecone_client.vector_store import VectorStore
+
+
+class RecordingIndex:
+    """Index stand-in that validates upserts the way the Pinecone client does."""
+    
+    def __init__(self):
+        self.vectors = []
+    
+    async def upsert(self, vectors):
+        self.vectors.extend(VectorFactory.build(vector, check_type=True) for vector in vectors)
+
+
+def _book(magnitudes):
+    """Build a book with one single-concept chapter per embedding magnitude."""
+    chapters = []
+    for number, magnitude in enumerate(magnitudes, start=1):
+        embedding = np.full(settings.PINECONE_DIMENSION, magnitude, dtype=np.float32)
+        embedding[0] = -magnitude
+        concept = Concept(name=f"Concept {number}", content="Text", type="explanation", embedding=embedding)
+        section = Section(title=f"Section {number}", concepts=[concept])
+        chapters.append(Chapter(number=number, title=f"Chapter {number}", sections=[section]))
+    return Book(title="Book", subject="Physics", chapters=chapters)
+
+
+@pytest.mark.asyncio
+async def test_int8_upsert_sends_float_values_with_one_book_scale(monkeypatch):
+    monkeypatch.setattr(settings, "PINECONE_INT8", True)
+    book = _book([0.5, 0.05])
+    index = RecordingIndex()
+    store = VectorStore(index)
+    
+    scale = int8_scale(np.stack([
+        concept.embedding
+        for chapter in book.chapters
+        for section in chapter.sections
+        for concept in section.concepts
+    ]))
+    
+    stored = 0
+    for chapter in book.chapters:
+        stored += await store.store_book_vectors(book, [chapter], embedding_scale=scale)
+    
+    assert stored == len(index.vectors) == 2
+    assert {vector.metadata["embedding_scale"] for vector in index.vectors} == {scale}
+    for vector in index.vectors:
+        assert all(isinstance(value, float) for value in vector.values)
+        assert max(abs(value) for value in vector.values) <= 127
\ No newline at end of file